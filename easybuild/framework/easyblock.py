@@ -89,6 +89,7 @@ from easybuild.tools.filetools import adjust_permissions, apply_patch, back_up_f
 from easybuild.tools.filetools import compute_checksum, convert_name, copy_dir, copy_file, create_lock
 from easybuild.tools.filetools import create_non_existing_paths, create_patch_info, derive_alt_pypi_url, diff_files
 from easybuild.tools.filetools import dir_contains_files, download_file, encode_class_name, extract_file
+from easybuild.tools.filetools import file_signature
 from easybuild.tools.filetools import find_backup_name_candidate, get_cwd, get_source_tarball_from_git, is_alt_pypi_url
 from easybuild.tools.filetools import is_binary, is_parent_path, is_sha256_checksum, mkdir, move_file, move_logs
 from easybuild.tools.filetools import read_file, remove_dir, remove_file, remove_lock, symlink, verify_checksum
@@ -126,6 +127,12 @@ PYPI_PKG_URL_PATTERN = 'pypi.python.org/packages/source/'
 # Directory name in which to store reproducibility files
 REPROD = 'reprod'
 
+# name of manifest file (in easybuild subdirectory of installation directory) with cached RPATH sanity check results
+RPATH_SANITY_CHECK_MANIFEST = 'rpath-sanity-check.json'
+RPATH_SANITY_LIB_PATH_REGEX = re.compile(r'\S+\s*\=\>\s*(\S+)')
+RPATH_SANITY_NOT_FOUND_REGEX = re.compile(r'(\S+)\s*\=\>\s*not found')
+RPATH_SANITY_READELF_RPATH_REGEX = re.compile(r'\(RPATH\)', re.M)
+
 _log = fancylogger.getLogger('easyblock')
 
 
@@ -3350,6 +3357,121 @@ class EasyBlock(object):
         self.cfg['builddependencies'] = builddeps
         self.cfg.iterating = False
 
+    def _rpath_sanity_check_manifest_path(self):
+        """Return path to manifest file with cached results of RPATH sanity check for this installation."""
+        return os.path.join(self.installdir, log_path(ec=self.cfg), RPATH_SANITY_CHECK_MANIFEST)
+
+    def _load_rpath_sanity_check_manifest(self, context):
+        """
+        Load cached results of RPATH sanity check from manifest file in installation directory.
+
+        Only results obtained in the same context (loaded modules, $LD_LIBRARY_PATH, relevant configuration options)
+        are retained; an empty dict is returned if there is no (usable) manifest.
+
+        :param context: dict with context in which RPATH sanity check is being run
+        """
+        manifest_path = self._rpath_sanity_check_manifest_path()
+        res = {}
+        if os.path.exists(manifest_path):
+            try:
+                manifest = json.loads(read_file(manifest_path))
+                if manifest['context'] == context:
+                    # signatures are stored as lists in JSON, convert them back to tuples
+                    for path, entry in manifest['files'].items():
+                        res[path] = {
+                            'fails': entry['fails'],
+                            'libs': [(p, tuple(s) if s else None) for (p, s) in entry['libs']],
+                            'signature': tuple(entry['signature']) if entry['signature'] else None,
+                        }
+                    self.log.info(f"Found {len(res)} cached RPATH sanity check results in {manifest_path}")
+                else:
+                    self.log.info(f"Context of RPATH sanity check manifest {manifest_path} has changed, ignoring it")
+            except (KeyError, TypeError, ValueError) as err:
+                self.log.warning(f"Ignoring corrupt RPATH sanity check manifest {manifest_path}: {err}")
+                res = {}
+
+        return res
+
+    def _save_rpath_sanity_check_manifest(self, context, results):
+        """
+        Save results of RPATH sanity check to manifest file in installation directory.
+
+        :param context: dict with context in which RPATH sanity check was run
+        :param results: dict with RPATH sanity check results for each checked file
+        """
+        manifest_path = self._rpath_sanity_check_manifest_path()
+        try:
+            write_file(manifest_path, json.dumps({'context': context, 'files': results}, indent=1, sort_keys=True))
+            self.log.info(f"RPATH sanity check results for {len(results)} files saved to {manifest_path}")
+        except EasyBuildError as err:
+            # failing to save the manifest should not make the sanity check fail
+            self.log.warning(f"Failed to save RPATH sanity check manifest {manifest_path}: {err}")
+
+    def _sanity_check_rpath_file(self, path, check_readelf_rpath, filter_rpath_sanity_libs):
+        """
+        Sanity check specified binary/library w.r.t. RPATH linking.
+
+        :param path: path to file to check
+        :param check_readelf_rpath: whether or not to check for '(RPATH)' section in 'readelf -d' output
+        :param filter_rpath_sanity_libs: list of libraries for which it's OK that they're not found
+        :return: tuple with list of failure messages and list of paths to libraries that were found to be linked
+        """
+        fails, lib_paths = [], []
+
+        self.log.debug(f"Sanity checking RPATH for {path}")
+
+        out = get_linked_libs_raw(path)
+
+        if out is None:
+            msg = "Failed to determine dynamically linked libraries for {path}, "
+            msg += "so skipping it in RPATH sanity check"
+            self.log.debug(msg)
+        else:
+            lib_paths = RPATH_SANITY_LIB_PATH_REGEX.findall(out)
+
+            # check whether all required libraries are found via 'ldd'
+            matches = RPATH_SANITY_NOT_FOUND_REGEX.findall(out)
+            if len(matches) > 0:  # Some libraries are not found via 'ldd'
+                # For each match, check if the library is in the exception list
+                for match in matches:
+                    if match in filter_rpath_sanity_libs:
+                        msg = f"Library {match} not found for {path}, but ignored "
+                        msg += f"since it is on the rpath exception list: {filter_rpath_sanity_libs}"
+                        self.log.info(msg)
+                    else:
+                        fail_msg = f"Library {match} not found for {path}"
+                        self.log.warning(fail_msg)
+                        fails.append(fail_msg)
+
+                # if any libraries were not found, log whether dependency libraries have an RPATH section
+                if fails:
+                    for lib_path in lib_paths:
+                        self.log.info(f"Checking whether dependency library {lib_path} has RPATH section")
+                        res = run_shell_cmd(f"readelf -d {lib_path}", fail_on_error=False)
+                        if res.exit_code:
+                            self.log.info(f"No RPATH section found in {lib_path}")
+            else:
+                self.log.debug(f"Output of 'ldd {path}' checked, looks OK")
+
+            # check whether RPATH section in 'readelf -d' output is there
+            if check_readelf_rpath:
+                fail_msg = None
+                res = run_shell_cmd(f"readelf -d {path}", fail_on_error=False, hidden=True)
+                if res.exit_code != EasyBuildExit.SUCCESS:
+                    fail_msg = f"Failed to run 'readelf -d {path}': {res.output}"
+                elif not RPATH_SANITY_READELF_RPATH_REGEX.search(res.output):
+                    fail_msg = f"No '(RPATH)' found in 'readelf -d' output for {path}"
+
+                if fail_msg:
+                    self.log.warning(fail_msg)
+                    fails.append(fail_msg)
+                else:
+                    self.log.debug(f"Output of 'readelf -d {path}' checked, looks OK")
+            else:
+                self.log.debug("Skipping the RPATH section check with 'readelf -d', as requested")
+
+        return fails, lib_paths
+
     def sanity_check_rpath(self, rpath_dirs=None, check_readelf_rpath=True):
         """Sanity check binaries/libraries w.r.t. RPATH linking."""
 
@@ -3370,10 +3492,6 @@ class EasyBlock(object):
         modules_list = self.modules_tool.list()
         self.log.debug(f"List of loaded modules: {modules_list}")
 
-        not_found_regex = re.compile(r'(\S+)\s*\=\>\s*not found')
-        lib_path_regex = re.compile(r'\S+\s*\=\>\s*(\S+)')
-        readelf_rpath_regex = re.compile(r'\(RPATH\)', re.M)
-
         # List of libraries that should be exempt from the RPATH sanity check;
         # For example, libcuda.so.1 should never be RPATH-ed by design,
         # see https://github.com/easybuilders/easybuild-framework/issues/4095
@@ -3390,64 +3508,52 @@ class EasyBlock(object):
         else:
             self.log.info(f"Using specified subdirs for binaries/libraries to verify RPATH linking: {rpath_dirs}")
 
+        # results of RPATH sanity check are only cached if requested, and never during a dry run;
+        # cached results are only valid in the exact same context, and as long as the checked file
+        # and all libraries that were found to be linked to it are unchanged
+        use_cache = build_option('cache_rpath_sanity_check') and not self.dry_run
+        if use_cache:
+            context = {
+                'check_readelf_rpath': check_readelf_rpath,
+                'filter_rpath_sanity_libs': sorted(filter_rpath_sanity_libs or []),
+                'ld_library_path': ld_library_path,
+                'loaded_modules': [mod['mod_name'] for mod in modules_list],
+            }
+            cached_results = self._load_rpath_sanity_check_manifest(context)
+        else:
+            cached_results = {}
+        new_results = {}
+
         for dirpath in [os.path.join(self.installdir, d) for d in rpath_dirs]:
             if os.path.exists(dirpath):
                 self.log.debug(f"Sanity checking RPATH for files in {dirpath}")
 
                 for path in [os.path.join(dirpath, x) for x in os.listdir(dirpath)]:
-                    self.log.debug(f"Sanity checking RPATH for {path}")
-
-                    out = get_linked_libs_raw(path)
-
-                    if out is None:
-                        msg = "Failed to determine dynamically linked libraries for {path}, "
-                        msg += "so skipping it in RPATH sanity check"
-                        self.log.debug(msg)
+                    signature = file_signature(path) if use_cache else None
+                    cached = cached_results.get(path)
+                    if cached and cached['signature'] == signature and \
+                            all(file_signature(p) == s for (p, s) in cached['libs']):
+                        self.log.debug(f"Using cached RPATH sanity check result for unchanged file {path}")
+                        file_fails = cached['fails']
+                        for fail_msg in file_fails:
+                            self.log.warning(fail_msg)
+                        new_results[path] = cached
                     else:
-                        # check whether all required libraries are found via 'ldd'
-                        matches = re.findall(not_found_regex, out)
-                        if len(matches) > 0:  # Some libraries are not found via 'ldd'
-                            # For each match, check if the library is in the exception list
-                            for match in matches:
-                                if match in filter_rpath_sanity_libs:
-                                    msg = f"Library {match} not found for {path}, but ignored "
-                                    msg += f"since it is on the rpath exception list: {filter_rpath_sanity_libs}"
-                                    self.log.info(msg)
-                                else:
-                                    fail_msg = f"Library {match} not found for {path}"
-                                    self.log.warning(fail_msg)
-                                    fails.append(fail_msg)
-
-                            # if any libraries were not found, log whether dependency libraries have an RPATH section
-                            if fails:
-                                lib_paths = re.findall(lib_path_regex, out)
-                                for lib_path in lib_paths:
-                                    self.log.info(f"Checking whether dependency library {lib_path} has RPATH section")
-                                    res = run_shell_cmd(f"readelf -d {lib_path}", fail_on_error=False)
-                                    if res.exit_code:
-                                        self.log.info(f"No RPATH section found in {lib_path}")
-                        else:
-                            self.log.debug(f"Output of 'ldd {path}' checked, looks OK")
-
-                        # check whether RPATH section in 'readelf -d' output is there
-                        if check_readelf_rpath:
-                            fail_msg = None
-                            res = run_shell_cmd(f"readelf -d {path}", fail_on_error=False, hidden=True)
-                            if res.exit_code != EasyBuildExit.SUCCESS:
-                                fail_msg = f"Failed to run 'readelf -d {path}': {res.output}"
-                            elif not readelf_rpath_regex.search(res.output):
-                                fail_msg = f"No '(RPATH)' found in 'readelf -d' output for {path}"
-
-                            if fail_msg:
-                                self.log.warning(fail_msg)
-                                fails.append(fail_msg)
-                            else:
-                                self.log.debug(f"Output of 'readelf -d {path}' checked, looks OK")
-                        else:
-                            self.log.debug("Skipping the RPATH section check with 'readelf -d', as requested")
+                        file_fails, lib_paths = self._sanity_check_rpath_file(path, check_readelf_rpath,
+                                                                              filter_rpath_sanity_libs)
+                        if use_cache:
+                            new_results[path] = {
+                                'fails': file_fails,
+                                'libs': [(p, file_signature(p)) for p in lib_paths],
+                                'signature': signature,
+                            }
+                    fails.extend(file_fails)
             else:
                 self.log.debug(f"Not sanity checking files in non-existing directory {dirpath}")
 
+        if use_cache:
+            self._save_rpath_sanity_check_manifest(context, new_results)
+
         if orig_env:
             env.restore_env_vars(orig_env)
 
@@ -3745,6 +3851,22 @@ class EasyBlock(object):
         else:
             self.log.debug("Skipping RPATH sanity check")
 
+    def run_sanity_check_cmds_parallel(self, cmds):
+        """
+        Run specified sanity check commands in parallel (up to configured level of parallelism at a time),
+        and return list of results (in the same order as the specified commands).
+
+        :param cmds: list of tuples with command to run, stdin, and working directory
+        """
+        max_workers = self.cfg.parallel if self.cfg.is_parallel_set else det_parallelism()
+        self.log.info("Running %d sanity check commands in parallel (max. %d at a time)", len(cmds), max_workers)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as thread_pool:
+            async_cmds = [thread_pool.submit(run_shell_cmd, cmd, stdin=stdin, work_dir=work_dir, hidden=True,
+                                             fail_on_error=False, asynchronous=True, task_id=idx)
+                          for (idx, (cmd, stdin, work_dir)) in enumerate(cmds)]
+            return [async_cmd.result() for async_cmd in async_cmds]
+
     def _sanity_check_step_extensions(self):
         """Sanity check on extensions (if any)."""
         failed_exts = []
@@ -3755,6 +3877,21 @@ class EasyBlock(object):
             self.prepare_for_extensions()
             self.init_ext_instances()
 
+        if build_option('parallel_sanity_check'):
+            # run exts_filter commands for all extensions in parallel up front;
+            # results are picked up by sanity_check_step of extensions, if they run the same command
+            exts_cmds = []
+            for ext in self.ext_instances:
+                exts_filter = ext.cfg.get_ref('exts_filter')
+                if exts_filter and ext.options.get('modulename', ext.name) is not False:
+                    cmd, stdin = resolve_exts_filter_template(exts_filter, ext)
+                    work_dir = ext.installdir if os.path.isdir(ext.installdir) else None
+                    exts_cmds.append((ext, (cmd, stdin, work_dir)))
+
+            exts_res = self.run_sanity_check_cmds_parallel([x[1] for x in exts_cmds])
+            for (ext, (cmd, stdin, _)), res in zip(exts_cmds, exts_res):
+                ext.exts_filter_res = (cmd, stdin, res)
+
         for ext in self.ext_instances:
             success, fail_msg = None, None
             res = ext.sanity_check_step()
@@ -3885,12 +4022,23 @@ class EasyBlock(object):
         # using the build or installation directory can produce false positives and polute them with files
         sanity_check_work_dir = tempfile.mkdtemp(prefix='eb-sanity-check-')
 
-        # run sanity check commands
-        for cmd in commands:
+        parallel_cmds = build_option('parallel_sanity_check') and len(commands) > 1
+        if parallel_cmds:
+            # each command gets a separate empty working directory when running commands in parallel,
+            # to avoid that they interfere with each other
+            trace_msg(f"running {len(commands)} sanity check commands in parallel ...")
+            work_dirs = [sanity_check_work_dir] + [tempfile.mkdtemp(prefix='eb-sanity-check-') for _ in commands[1:]]
+            cmds_res = self.run_sanity_check_cmds_parallel([(cmd, None, wd) for cmd, wd in zip(commands, work_dirs)])
+
+        # run sanity check commands (or process results in order, if commands were run in parallel)
+        for idx, cmd in enumerate(commands):
 
             trace_msg(f"running command '{cmd}' ...")
 
-            res = run_shell_cmd(cmd, work_dir=sanity_check_work_dir, fail_on_error=False, hidden=True)
+            if parallel_cmds:
+                res = cmds_res[idx]
+            else:
+                res = run_shell_cmd(cmd, work_dir=sanity_check_work_dir, fail_on_error=False, hidden=True)
             if res.exit_code != EasyBuildExit.SUCCESS:
                 fail_msg = f"sanity check command {cmd} failed with exit code {res.exit_code} (output: {res.output})"
                 self.sanity_check_fail_msgs.append(fail_msg)
@@ -4066,13 +4214,17 @@ class EasyBlock(object):
 
             self.invalidate_module_caches(modpath)
 
-            # only update after generating final module file
-            if not fake:
-                self.modules_tool.update()
-
             mod_symlink_paths = ActiveMNS().det_module_symlink_paths(self.cfg)
             self.module_generator.create_symlinks(mod_symlink_paths, fake=fake)
 
+            # only update after generating final module file;
+            # update of modules tool cache may be postponed, to do it only once for multiple installations
+            if not fake:
+                updated_modpaths = [modpath]
+                updated_modpaths.extend(self.module_generator.get_modules_path(mod_path_suffix=p)
+                                        for p in mod_symlink_paths)
+                self.modules_tool.update(modpaths=updated_modpaths)
+
             if ActiveMNS().mns.det_make_devel_module() and not fake and build_option('generate_devel_module'):
                 try:
                     self.make_devel_module()
@@ -80,7 +80,7 @@ from easybuild.tools.modules import modules_tool, NoModulesTool
 from easybuild.tools.systemtools import check_os_dependency, pick_dep_version
 from easybuild.tools.toolchain.toolchain import SYSTEM_TOOLCHAIN_NAME, is_system_toolchain
 from easybuild.tools.toolchain.toolchain import TOOLCHAIN_CAPABILITIES, TOOLCHAIN_CAPABILITY_CUDA
-from easybuild.tools.toolchain.utilities import get_toolchain, search_toolchain
+from easybuild.tools.toolchain.utilities import get_toolchain, search_toolchain, toolchain_registry
 from easybuild.tools.utilities import flatten, get_class_for, nub, quote_py_str, remove_unwanted_chars
 from easybuild.tools.version import VERSION
 from easybuild.toolchains.compiler.cuda import Cuda
@@ -315,11 +315,11 @@ def get_toolchain_hierarchy(parent_toolchain, incl_capabilities=False):
     :param parent_toolchain: dictionary with name/version of parent toolchain
     :param incl_capabilities: also register toolchain capabilities in result
     """
-    # obtain list of all possible subtoolchains
-    _, all_tc_classes = search_toolchain('')
-    subtoolchains = {tc_class.NAME: getattr(tc_class, 'SUBTOOLCHAIN', None) for tc_class in all_tc_classes}
-    optional_toolchains = set(tc_class.NAME for tc_class in all_tc_classes if getattr(tc_class, 'OPTIONAL', False))
-    composite_toolchains = set(tc_class.NAME for tc_class in all_tc_classes if len(tc_class.__bases__) > 1)
+    # obtain list of all possible subtoolchains (via toolchain registry, to avoid importing all toolchain modules)
+    tc_registry = toolchain_registry()
+    subtoolchains = {tc_name: tc_metadata['subtoolchain'] for tc_name, tc_metadata in tc_registry.items()}
+    optional_toolchains = set(tc_name for tc_name, tc_metadata in tc_registry.items() if tc_metadata['optional'])
+    composite_toolchains = set(tc_name for tc_name, tc_metadata in tc_registry.items() if tc_metadata['composite'])
 
     # the parent toolchain is at the top of the hierarchy,
     # we need a copy so that adding capabilities (below) doesn't affect the original object
@@ -38,11 +38,8 @@ from easybuild.framework.easyconfig.easyconfig import EasyConfig
 from easybuild.tools.build_log import EasyBuildError, print_msg
 from easybuild.tools.utilities import only_if_module_is_available
 
-try:
-    import pycodestyle
-    from pycodestyle import StyleGuide, register_check, trailing_whitespace
-except ImportError:
-    pass
+# note: pycodestyle is only imported when it is actually needed (in check_easyconfigs_style),
+# to avoid that it is imported on every 'eb' startup
 
 _log = fancylogger.getLogger('easyconfig.style', fname=False)
 
@@ -77,6 +74,8 @@ def _eb_check_trailing_whitespace(physical_line, lines, line_number, checker_sta
     The arguments are explained at
     https://pycodestyle.readthedocs.io/en/latest/developer.html#contribute
     """
+    from pycodestyle import trailing_whitespace
+
     # apparently this is not the same as physical_line line?!
     line = lines[line_number - 1]
 
@@ -108,7 +107,9 @@ def check_easyconfigs_style(easyconfigs, verbose=False):
     :param verbose: print our statistics and be verbose about the errors and warning
     :return: the number of warnings and errors
     """
+    import pycodestyle
     reload(pycodestyle)
+    from pycodestyle import StyleGuide, register_check
 
     # register the extra checks before using pep8:
     # any function in this module starting with `_eb_check_` will be used.
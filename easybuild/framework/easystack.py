@@ -38,10 +38,7 @@ from easybuild.base import fancylogger
 from easybuild.tools.build_log import EasyBuildError
 from easybuild.tools.filetools import read_file
 from easybuild.tools.utilities import only_if_module_is_available
-try:
-    import yaml
-except ImportError:
-    pass
+
 _log = fancylogger.getLogger('easystack', fname=False)
 
 EASYSTACK_DOC_URL = 'https://docs.easybuild.io/en/latest/Easystack-files.html'
@@ -108,6 +105,9 @@ class EasyStackParser(object):
     def parse(filepath):
         """
         Parses YAML file and assigns obtained values to SW config instances as well as general config instance"""
+        # only import yaml when it's actually needed, to avoid slowing down 'eb' startup
+        import yaml
+
         yaml_txt = read_file(filepath)
 
         try:
@@ -163,6 +163,9 @@ class Extension(object):
         self.sanity_check_fail_msgs = []
         self.sanity_check_module_loaded = False
         self.fake_mod_data = None
+        # result of exts_filter command that was already run (in parallel) for sanity check,
+        # as tuple with command, stdin, and result (see EasyBlock._sanity_check_step_extensions)
+        self.exts_filter_res = None
 
         self.async_cmd_task = None
 
@@ -314,7 +317,15 @@ class Extension(object):
             self.log.info("modulename set to False for '%s' extension, so skipping sanity check", self.name)
         elif exts_filter:
             cmd, stdin = resolve_exts_filter_template(exts_filter, self)
-            cmd_res = run_shell_cmd(cmd, fail_on_error=False, stdin=stdin)
+            # use result of exts_filter command that was already run, if it's the same command
+            # (not set for stand-alone installations via ExtensionEasyBlock)
+            exts_filter_res = getattr(self, 'exts_filter_res', None)
+            if exts_filter_res and exts_filter_res[:2] == (cmd, stdin):
+                self.log.info("Using result of exts_filter command '%s' that was already run", cmd)
+                cmd_res = exts_filter_res[2]
+                self.exts_filter_res = None
+            else:
+                cmd_res = run_shell_cmd(cmd, fail_on_error=False, stdin=stdin)
 
             if cmd_res.exit_code != EasyBuildExit.SUCCESS:
                 if stdin:
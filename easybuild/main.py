@@ -40,6 +40,7 @@ Authors:
 * Bart Oldeman (McGill University, Calcul Quebec, Digital Research Alliance of Canada)
 """
 import copy
+import io
 import os
 import stat
 import sys
@@ -53,24 +54,16 @@ from easybuild.tools.build_log import EasyBuildError, print_error, print_msg, pr
 from easybuild.framework.easyblock import build_and_install_one, inject_checksums, inject_checksums_to_json
 from easybuild.framework.easyconfig import EASYCONFIGS_PKG_SUBDIR
 from easybuild.framework.easyconfig import easyconfig
-from easybuild.framework.easystack import parse_easystack
 from easybuild.framework.easyconfig.easyconfig import clean_up_easyconfigs
 from easybuild.framework.easyconfig.easyconfig import fix_deprecated_easyconfigs, verify_easyconfig_filename
-from easybuild.framework.easyconfig.style import cmdline_easyconfigs_style_check
 from easybuild.framework.easyconfig.tools import categorize_files_by_type, dep_graph, det_copy_ec_specs
 from easybuild.framework.easyconfig.tools import det_easyconfig_paths, dump_env_script, get_paths_for
 from easybuild.framework.easyconfig.tools import parse_easyconfigs, review_pr, run_contrib_checks, skip_available
 from easybuild.framework.easyconfig.tweak import obtain_ec_for, tweak
 from easybuild.tools.config import find_last_log, get_repository, get_repositorypath, build_option
-from easybuild.tools.containers.common import containerize
-from easybuild.tools.docs import list_software
 from easybuild.tools.environment import restore_env
 from easybuild.tools.filetools import adjust_permissions, cleanup, copy_files, dump_index, load_index
 from easybuild.tools.filetools import locate_files, read_file, register_lock_cleanup_signal_handlers, write_file
-from easybuild.tools.github import check_github, close_pr, find_easybuild_easyconfig
-from easybuild.tools.github import add_pr_labels, install_github_token, list_prs, merge_pr, new_branch_github, new_pr
-from easybuild.tools.github import new_pr_from_branch
-from easybuild.tools.github import sync_branch_with_develop, sync_pr_with_develop, update_branch, update_pr
 from easybuild.tools.hooks import BUILD_AND_INSTALL_LOOP, PRE_PREF, POST_PREF, START, END, CANCEL, CRASH, FAIL
 from easybuild.tools.hooks import load_hooks, run_hook
 from easybuild.tools.modules import modules_tool
@@ -78,17 +71,21 @@ from easybuild.tools.options import opts_dict_to_eb_opts, set_up_configuration,
 from easybuild.tools.output import COLOR_GREEN, COLOR_RED, STATUS_BAR, colorize, print_checks, rich_live_cm
 from easybuild.tools.output import start_progress_bar, stop_progress_bar, update_progress_bar
 from easybuild.tools.robot import check_conflicts, dry_run, missing_deps, resolve_dependencies, search_easyconfigs
-from easybuild.tools.package.utilities import check_pkg_support
-from easybuild.tools.parallelbuild import submit_jobs
 from easybuild.tools.repository.repository import init_repository
-from easybuild.tools.systemtools import check_easybuild_deps
-from easybuild.tools.testing import create_test_report, overall_test_report, regtest, session_state
+from easybuild.tools.testing import create_test_report, overall_test_report, session_state
 from easybuild.tools.version import EASYBLOCKS_VERSION, FRAMEWORK_VERSION, UNKNOWN_EASYBLOCKS_VERSION
 from easybuild.tools.version import different_major_versions
 
+# note: modules that implement functionality that is only relevant when particular configuration options are used
+# (GitHub integration, containers, docs, packaging, job submission, regression testing, style checks, ...)
+# are only imported when they are actually needed, to minimize startup time of the 'eb' command
 
 _log = None
 
+# easyconfigs (+ initial environment) to perform extended dry run for in worker processes,
+# see extended_dry_run_parallel
+_DRY_RUN_ECS = []
+
 
 def find_easyconfigs_by_specs(build_specs, robot_path, try_to_generate, testing=False):
     """Find easyconfigs by build specifications."""
@@ -111,6 +108,53 @@ def find_easyconfigs_by_specs(build_specs, robot_path, try_to_generate, testing=
     return [(ec_file, generated)]
 
 
+def _extended_dry_run_one(idx):
+    """
+    Perform extended dry run for easyconfig with specified index in _DRY_RUN_ECS (in a worker process).
+
+    :return: tuple with captured stdout/stderr output, result of build_and_install_one, and error info (if any)
+    """
+    ec, init_env = _DRY_RUN_ECS[idx]
+
+    orig_stdout, orig_stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+    res, err = None, None
+    try:
+        res = build_and_install_one(ec, init_env)
+    except Exception as error:
+        # purposely catch all exceptions;
+        # only pass back error message and traceback, since exceptions are not necessarily picklable
+        err = (str(error), traceback.format_exc())
+    finally:
+        out, err_out = sys.stdout.getvalue(), sys.stderr.getvalue()
+        sys.stdout, sys.stderr = orig_stdout, orig_stderr
+
+    return (out, err_out, res, err)
+
+
+def extended_dry_run_parallel(ecs, init_env, max_workers):
+    """
+    Perform extended dry run for specified easyconfigs in parallel, each in a separate worker process.
+
+    :param ecs: list of parsed easyconfigs
+    :param init_env: original environment (used to reset environment)
+    :param max_workers: maximum number of worker processes
+    :return: list of results of _extended_dry_run_one, in the same order as the specified easyconfigs
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    _log.info("Performing extended dry run for %d easyconfigs using %d worker processes", len(ecs), max_workers)
+
+    # worker processes are forked, so they inherit configuration and list of easyconfigs to process
+    _DRY_RUN_ECS[:] = [(ec, init_env) for ec in ecs]
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('fork')) as pool:
+            return list(pool.map(_extended_dry_run_one, range(len(ecs))))
+    finally:
+        _DRY_RUN_ECS[:] = []
+
+
 def build_and_install_software(ecs, init_session_state, exit_on_failure=True):
     """
     Build and install software for all provided parsed easyconfig files.
@@ -124,17 +168,33 @@ def build_and_install_software(ecs, init_session_state, exit_on_failure=True):
     # e.g. via easyconfig.handle_allowed_system_deps
     init_env = copy.deepcopy(os.environ)
 
+    # extended dry run can be performed in parallel for multiple easyconfigs (in separate processes),
+    # captured output is printed below in original order
+    dry_run_res = None
+    dry_run_max_workers = build_option('extended_dry_run_parallel')
+    if build_option('extended_dry_run') and dry_run_max_workers and dry_run_max_workers > 1 and len(ecs) > 1:
+        dry_run_res = extended_dry_run_parallel(ecs, init_env, dry_run_max_workers)
+
     start_progress_bar(STATUS_BAR, size=len(ecs))
 
     res = []
     ec_results = []
     failed_cnt = 0
 
-    for ec in ecs:
+    for idx, ec in enumerate(ecs):
 
         ec_res = {}
         try:
-            (ec_res['success'], app_log, err_msg, err_code) = build_and_install_one(ec, init_env)
+            if dry_run_res:
+                out, err_out, one_res, err = dry_run_res[idx]
+                sys.stdout.write(out)
+                sys.stderr.write(err_out)
+                if err:
+                    ec_res['traceback'] = err[1]
+                    raise EasyBuildError(err[0])
+            else:
+                one_res = build_and_install_one(ec, init_env)
+            (ec_res['success'], app_log, err_msg, err_code) = one_res
             ec_res['log_file'] = app_log
             if not ec_res['success']:
                 ec_res['err'] = EasyBuildError(err_msg, exit_code=err_code)
@@ -142,7 +202,8 @@ def build_and_install_software(ecs, init_session_state, exit_on_failure=True):
             # purposely catch all exceptions
             ec_res['success'] = False
             ec_res['err'] = err
-            ec_res['traceback'] = traceback.format_exc()
+            # traceback may have been determined already in worker process (for parallel extended dry run)
+            ec_res.setdefault('traceback', traceback.format_exc())
 
         if ec_res['success']:
             ec_results.append(ec['full_mod_name'] + ' (' + colorize('OK', COLOR_GREEN) + ')')
@@ -201,6 +262,8 @@ def run_contrib_style_checks(ecs, check_contrib, check_style):
 
     :return: boolean indicating whether or not any checks were actually performed
     """
+    from easybuild.framework.easyconfig.style import cmdline_easyconfigs_style_check
+
     check_actions = {
         'contribution': (check_contrib, run_contrib_checks),
         'style': (check_style, cmdline_easyconfigs_style_check),
@@ -235,6 +298,8 @@ def process_easystack(easystack_path, args, logfile, testing, init_session_state
     :param init_session_state: initial session state, to use in test reports
     :param do_build: whether or not to actually perform the build
     """
+    from easybuild.framework.easystack import parse_easystack
+
     easystack = parse_easystack(easystack_path)
 
     # keep copy of original environment, so we can restore it for every easystack entry
@@ -322,6 +387,7 @@ def process_eb_args(eb_args, eb_go, cfg_settings, modtool, testing, init_session
             raise EasyBuildError("Installing the latest EasyBuild release can not be combined with installing "
                                  "other easyconfigs")
         else:
+            from easybuild.tools.github import find_easybuild_easyconfig
             eb_file = find_easybuild_easyconfig()
             eb_args.append(eb_file)
 
@@ -396,6 +462,7 @@ def process_eb_args(eb_args, eb_go, cfg_settings, modtool, testing, init_session
     if options.regtest or options.aggregate_regtest:
         _log.info("Running regression test")
         # fallback: easybuild-easyconfigs install path
+        from easybuild.tools.testing import regtest
         regtest_ok = regtest([x for (x, _) in paths] or easyconfigs_pkg_paths, modtool)
         if not regtest_ok:
             _log.info("Regression test failed (partially)!")
@@ -437,6 +504,7 @@ def process_eb_args(eb_args, eb_go, cfg_settings, modtool, testing, init_session
 
     if options.containerize:
         # if --containerize/-C create a container recipe (and optionally container image), and stop
+        from easybuild.tools.containers.common import containerize
         containerize(easyconfigs)
         return True
 
@@ -490,6 +558,9 @@ def process_eb_args(eb_args, eb_go, cfg_settings, modtool, testing, init_session
 
     # creating/updating PRs
     if any_pr_option_set:
+        from easybuild.tools.github import new_branch_github, new_pr, new_pr_from_branch
+        from easybuild.tools.github import sync_branch_with_develop, sync_pr_with_develop, update_branch, update_pr
+
         if options.new_pr:
             new_pr(categorized_paths, ordered_ecs)
         elif options.new_branch_github:
@@ -555,6 +626,7 @@ def process_eb_args(eb_args, eb_go, cfg_settings, modtool, testing, init_session
 
     # submit build as job(s), clean up and exit
     if options.job:
+        from easybuild.tools.parallelbuild import submit_jobs
         submit_jobs(ordered_ecs, eb_go.generate_cmd_line(), testing=testing, tweak_map=tweak_map)
         if not testing:
             print_msg("Submitted parallel build jobs, exiting now")
@@ -566,8 +638,12 @@ def process_eb_args(eb_args, eb_go, cfg_settings, modtool, testing, init_session
 
         with rich_live_cm():
             run_hook(PRE_PREF + BUILD_AND_INSTALL_LOOP, hooks, args=[ordered_ecs])
-            ecs_with_res = build_and_install_software(ordered_ecs, init_session_state,
-                                                      exit_on_failure=exit_on_failure)
+            try:
+                ecs_with_res = build_and_install_software(ordered_ecs, init_session_state,
+                                                          exit_on_failure=exit_on_failure)
+            finally:
+                # perform postponed update of modules tool cache (if any), once for all installations
+                modtool.flush_updates()
             run_hook(POST_PREF + BUILD_AND_INSTALL_LOOP, hooks, args=[ecs_with_res])
     else:
         ecs_with_res = [(ec, {}) for ec in ordered_ecs]
@@ -646,6 +722,7 @@ def main(args=None, logfile=None, do_build=None, testing=False, modtool=None, pr
 
     # check whether packaging is supported when it's being used
     if options.package:
+        from easybuild.tools.package.utilities import check_pkg_support
         check_pkg_support()
     else:
         _log.debug("Packaging not enabled, so not checking for packaging support.")
@@ -656,22 +733,28 @@ def main(args=None, logfile=None, do_build=None, testing=False, modtool=None, pr
                            terse=options.terse)
 
     if options.check_eb_deps:
+        from easybuild.tools.systemtools import check_easybuild_deps
         print_checks(check_easybuild_deps(modtool))
 
     # GitHub options that warrant a silent cleanup & exit
     if options.check_github:
+        from easybuild.tools.github import check_github
         check_github()
 
     elif options.install_github_token:
+        from easybuild.tools.github import install_github_token
         install_github_token(options.github_user, silent=build_option('silent'))
 
     elif options.close_pr:
+        from easybuild.tools.github import close_pr
         close_pr(options.close_pr, motivation_msg=options.close_pr_msg)
 
     elif options.list_prs:
+        from easybuild.tools.github import list_prs
         print(list_prs(options.list_prs))
 
     elif options.merge_pr:
+        from easybuild.tools.github import merge_pr
         merge_pr(options.merge_pr)
 
     elif options.review_pr:
@@ -679,13 +762,16 @@ def main(args=None, logfile=None, do_build=None, testing=False, modtool=None, pr
                         max_ecs=options.review_pr_max, filter_ecs=options.review_pr_filter))
 
     elif options.add_pr_labels:
+        from easybuild.tools.github import add_pr_labels
         add_pr_labels(options.add_pr_labels)
 
     elif options.list_installed_software:
+        from easybuild.tools.docs import list_software
         detailed = options.list_installed_software == 'detailed'
         print(list_software(output_format=options.output_format, detailed=detailed, only_installed=True))
 
     elif options.list_software:
+        from easybuild.tools.docs import list_software
         print(list_software(output_format=options.output_format, detailed=options.list_software == 'detailed'))
 
     elif options.create_index:
@@ -54,6 +54,11 @@ def get_build_stats(app, start_time, command_line):
         ('command_line', command_line),
         ('modules_tool', app.modules_tool.buildstats()),
     ])
+
+    comp_cache_report = app.toolchain.comp_cache_report()
+    if comp_cache_report is not None:
+        buildstats['compiler_cache'] = comp_cache_report
+
     for key, val in sorted(get_system_info().items()):
         buildstats.update({key: val})
 
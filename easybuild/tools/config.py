@@ -103,6 +103,7 @@ DEFAULT_MAX_FAIL_RATIO_PERMS = 0.5
 DEFAULT_MAX_PARALLEL = 16
 DEFAULT_MINIMAL_BUILD_ENV = 'CC:gcc,CXX:g++'
 DEFAULT_MNS = 'EasyBuildMNS'
+DEFAULT_MODULE_LOAD_BATCH_SIZE = 1
 DEFAULT_MODULE_SYNTAX = 'Lua'
 DEFAULT_MODULES_TOOL = 'Lmod'
 DEFAULT_PATH_SUBDIRS = {
@@ -222,6 +223,7 @@ BUILD_OPTIONS_CMDLINE = {
         'aggregate_regtest',
         'backup_modules',
         'banned_linked_shared_libs',
+        'ccache_max_size',
         'checksum_priority',
         'container_config',
         'container_image_format',
@@ -234,6 +236,7 @@ BUILD_OPTIONS_CMDLINE = {
         'dump_test_report',
         'easyblock',
         'envvars_user_modules',
+        'extended_dry_run_parallel',
         'extra_modules',
         'filter_deps',
         'filter_ecs',
@@ -259,9 +262,11 @@ BUILD_OPTIONS_CMDLINE = {
         'job_max_walltime',
         'job_output_dir',
         'job_polling_interval',
+        'job_prepare_threads',
         'job_target_resource',
         'locks_dir',
         'module_cache_suffix',
+        'module_load_batch_size',
         'modules_footer',
         'modules_header',
         'mpi_cmd_template',
@@ -287,7 +292,9 @@ BUILD_OPTIONS_CMDLINE = {
         'sysroot',
         'test_report_env_filter',
         'testoutput',
+        'toolchain_registry_cache',
         'umask',
+        'update_modules_tool_cache_batch_size',
         'zip_logs',
     ],
     False: [
@@ -295,6 +302,8 @@ BUILD_OPTIONS_CMDLINE = {
         'allow_modules_tool_mismatch',
         'allow_unresolved_templates',
         'backup_patched_files',
+        'cache_rpath_sanity_check',
+        'ccache_compress',
         'consider_archived_easyconfigs',
         'container_build_image',
         'debug',
@@ -314,12 +323,15 @@ BUILD_OPTIONS_CMDLINE = {
         'ignore_locks',
         'ignore_test_failure',
         'install_latest_eb_release',
+        'job_array_jobs',
+        'job_defer_fetch',
         'keep_debug_symbols',
         'logtostdout',
         'minimal_toolchains',
         'module_only',
         'package',
         'parallel_extensions_install',
+        'parallel_sanity_check',
         'read_only_installdir',
         'rebuild',
         'remove_ghost_install_dirs',
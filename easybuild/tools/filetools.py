@@ -2354,6 +2354,19 @@ def det_size(path):
     return installsize
 
 
+def file_signature(path):
+    """
+    Determine signature of specified file, which can be used to cheaply check whether it has changed:
+    a tuple with inode, modification time (in nanoseconds) and size.
+    Symbolic links are resolved; None is returned if the path does not exist (anymore).
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
 def find_flexlm_license(custom_env_vars=None, lic_specs=None):
     """
     Find FlexLM license.
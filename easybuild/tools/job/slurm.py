@@ -29,8 +29,6 @@ Authors:
 
 * Kenneth Hoste (Ghent University)
 """
-import re
-
 from easybuild.base import fancylogger
 from easybuild.tools import LooseVersion
 from easybuild.tools.build_log import EasyBuildError, print_msg
@@ -42,6 +40,9 @@ from easybuild.tools.run import run_shell_cmd
 
 _log = fancylogger.getLogger('slurm', fname=False)
 
+# job specs that are allowed to differ between jobs that are grouped into a single array job
+ARRAY_UNIQUE_SPECS = ['dependency', 'hold', 'job-name', 'output', 'wrap']
+
 
 class Slurm(JobBackend):
     """
@@ -91,58 +92,152 @@ class Slurm(JobBackend):
         Initialise the PySlurm job backend.
         """
         self._submitted = []
+        self._queued = []
+        self._held_jobids = []
 
     def queue(self, job, dependencies=frozenset()):
         """
         Add a job to the queue.
 
+        Jobs are only actually submitted when complete() is called,
+        so they can be submitted in bulk (level per level).
+
         :param dependencies: jobs on which this job depends.
         """
-        submit_cmd = 'sbatch'
+        job.dependencies = list(dependencies)
+        self._queued.append(job)
 
-        if dependencies:
-            job.job_specs['dependency'] = self.job_deps_type + ':' + ':'.join(str(d.jobid) for d in dependencies)
-            # make sure job that has invalid dependencies doesn't remain queued indefinitely
-            submit_cmd += " --kill-on-invalid-dep=yes"
+    def _sbatch(self, job_specs, kill_on_invalid_dep=False):
+        """
+        Submit job with specified specs using 'sbatch --parsable', and return job ID.
 
-        # submit job with hold in place
-        job.job_specs['hold'] = True
+        :param job_specs: dict with job specifications (translated to --<key> "<value>" options)
+        :param kill_on_invalid_dep: make sure job that has invalid dependencies doesn't remain queued indefinitely
+        """
+        submit_cmd = 'sbatch --parsable'
+
+        if kill_on_invalid_dep:
+            submit_cmd += " --kill-on-invalid-dep=yes"
 
-        self.log.info("Submitting job with following specs: %s", job.job_specs)
-        for key in sorted(job.job_specs):
+        self.log.info("Submitting job with following specs: %s", job_specs)
+        for key in sorted(job_specs):
             if key in ['hold']:
-                if job.job_specs[key]:
+                if job_specs[key]:
                     submit_cmd += " --%s" % key
             else:
-                submit_cmd += ' --%s "%s"' % (key, job.job_specs[key])
+                submit_cmd += ' --%s "%s"' % (key, job_specs[key])
 
         cmd_res = run_shell_cmd(submit_cmd, hidden=True)
 
-        jobid_regex = re.compile("^Submitted batch job (?P<jobid>[0-9]+)")
-
-        regex_res = jobid_regex.search(cmd_res.output)
-        if regex_res:
-            job.jobid = regex_res.group('jobid')
-            self.log.info("Job submitted, got job ID %s", job.jobid)
-        else:
+        # output of 'sbatch --parsable' is '<jobid>[;<cluster_name>]'
+        out_lines = cmd_res.output.strip().splitlines()
+        jobid = out_lines[0].split(';')[0].strip() if out_lines else ''
+        if not jobid.isdigit():
             raise EasyBuildError("Failed to determine job ID from output of submission command: %s", cmd_res.output)
 
+        self.log.info("Job submitted, got job ID %s", jobid)
+        return jobid
+
+    def _set_dependencies(self, job):
+        """Define dependency and hold specs for specified job (requires that dependencies were submitted)."""
+        if job.dependencies:
+            job.job_specs['dependency'] = self.job_deps_type + ':' + ':'.join(str(d.jobid) for d in job.dependencies)
+
+        # submit job with hold in place
+        job.job_specs['hold'] = True
+
+    def _submit_job(self, job):
+        """Submit a single job."""
+        self._set_dependencies(job)
+        job.jobid = self._sbatch(job.job_specs, kill_on_invalid_dep=bool(job.dependencies))
+        self._held_jobids.append(job.jobid)
         self._submitted.append(job)
 
+    def _submit_array_job(self, jobs):
+        """
+        Submit specified jobs as a single array job.
+
+        All jobs must have identical resource requirements and dependencies;
+        each job is mapped to an array task via $SLURM_ARRAY_TASK_ID.
+        """
+        for job in jobs:
+            self._set_dependencies(job)
+
+        cases = ['%d) %s ;;' % (idx, job.script) for idx, job in enumerate(jobs)]
+        # job name, output file and command to run are replaced, other specs are identical for all jobs
+        array_specs = jobs[0].job_specs.copy()
+        # %A is replaced with array job ID, %a with array task index
+        array_specs.update({
+            'array': '0-%d' % (len(jobs) - 1),
+            'job-name': 'easybuild-array',
+            'output': 'easybuild-array-%A_%a.out',
+            # $ must be escaped since value is passed via double quotes to sbatch
+            'wrap': 'case \\$SLURM_ARRAY_TASK_ID in %s esac' % ' '.join(cases),
+        })
+
+        array_jobid = self._sbatch(array_specs, kill_on_invalid_dep=bool(jobs[0].dependencies))
+        self.log.info("Submitted %d jobs as array job %s: %s", len(jobs), array_jobid, [job.name for job in jobs])
+
+        for idx, job in enumerate(jobs):
+            job.jobid = '%s_%d' % (array_jobid, idx)
+            self._submitted.append(job)
+
+        self._held_jobids.append(array_jobid)
+
+    def _submit_queued(self):
+        """
+        Submit all queued jobs, in topological levels.
+
+        Jobs in a particular level only depend on jobs in earlier levels.
+        If enabled via --job-array-jobs, leaf jobs (on which no other jobs depend) in the same level
+        that have identical resource requirements and dependencies are grouped into Slurm array jobs.
+        """
+        levels = {}
+        dependees = set()
+        for job in self._queued:
+            levels[id(job)] = max([levels.get(id(dep), -1) for dep in job.dependencies] + [-1]) + 1
+            dependees.update(id(dep) for dep in job.dependencies)
+
+        use_array_jobs = build_option('job_array_jobs')
+        sbatch_cnt = 0
+
+        for level in sorted(set(levels.values())):
+            level_jobs = [job for job in self._queued if levels[id(job)] == level]
+            self.log.info("Submitting %d jobs in level %d", len(level_jobs), level)
+
+            groups = []
+            group_idx = {}
+            for job in level_jobs:
+                if use_array_jobs and id(job) not in dependees:
+                    key = (tuple(sorted((k, v) for (k, v) in job.job_specs.items() if k not in ARRAY_UNIQUE_SPECS)),
+                           tuple(sorted(str(dep.jobid) for dep in job.dependencies)))
+                    if key in group_idx:
+                        groups[group_idx[key]].append(job)
+                        continue
+                    group_idx[key] = len(groups)
+                groups.append([job])
+
+            for group in groups:
+                if len(group) > 1:
+                    self._submit_array_job(group)
+                else:
+                    self._submit_job(group[0])
+                sbatch_cnt += 1
+
+        self.log.info("Submitted %d jobs using %d 'sbatch' commands", len(self._queued), sbatch_cnt)
+        self._queued = []
+
     def complete(self):
         """
         Complete a bulk job submission.
 
-        Release all user holds on submitted jobs, and disconnect from server.
+        Submit all queued jobs, release all user holds on submitted jobs, and disconnect from server.
         """
-        job_ids = []
-        for job in self._submitted:
-            if job.job_specs['hold']:
-                self.log.info("releasing user hold on job %s" % job.jobid)
-                job_ids.append(job.jobid)
+        self._submit_queued()
 
-        if job_ids:
-            run_shell_cmd("scontrol release %s" % ' '.join(job_ids), hidden=True)
+        if self._held_jobids:
+            self.log.info("releasing user hold on jobs %s", self._held_jobids)
+            run_shell_cmd("scontrol release %s" % ' '.join(self._held_jobids), hidden=True)
 
         submitted_jobs = '; '.join(["%s (%s): %s" % (job.name, job.module, job.jobid) for job in self._submitted])
         print_msg("List of submitted jobs (%d): %s" % (len(self._submitted), submitted_jobs), log=self.log)
@@ -160,6 +255,7 @@ class SlurmJob(object):
         self.log = fancylogger.getLogger(self.__class__.__name__, fname=False)
 
         self.jobid = None
+        self.dependencies = []
         self.script = script
         self.name = name
 
@@ -48,13 +48,18 @@ from easybuild.base import fancylogger
 from easybuild.tools import LooseVersion
 from easybuild.tools.build_log import EasyBuildError, print_warning
 from easybuild.tools.config import build_option, get_module_syntax, install_path
-from easybuild.tools.filetools import convert_name, mkdir, read_file, remove_file, resolve_path, symlink, write_file
+from easybuild.tools.filetools import convert_name, file_signature, mkdir, read_file, remove_file, resolve_path, symlink
+from easybuild.tools.filetools import write_file
 from easybuild.tools.modules import ROOT_ENV_VAR_NAME_PREFIX, EnvironmentModulesC, Lmod, modules_tool
 from easybuild.tools.utilities import get_subclasses, nub, quote_str
 
 
 _log = fancylogger.getLogger('module_generator', fname=False)
 
+# cache for (direct) dependencies of module files, see module_file_dependencies
+# key: module file path; value: tuple with file signature and list of names of modules loaded in module file
+MODULE_DEPS_CACHE = {}
+
 
 def avail_module_generators():
     """
@@ -89,32 +94,64 @@ def module_load_regex(modfilepath):
     return re.compile(regex, re.M)
 
 
-def dependencies_for(mod_name, modtool, depth=None):
+def module_file_dependencies(mod_filepath):
     """
-    Obtain a list of dependencies for the given module, determined recursively, up to a specified depth (optionally)
-    :param depth: recursion depth (default is None, which corresponds to infinite recursion depth)
+    Return list of (direct) dependencies loaded in the specified module file.
+
+    Each module file is only read and parsed once, unless it was changed since.
     """
-    mod_filepath = modtool.modulefile_path(mod_name)
-    modtxt = read_file(mod_filepath)
-    loadregex = module_load_regex(mod_filepath)
-    mods = loadregex.findall(modtxt)
-
-    if depth is None or depth > 0:
-        if depth and depth > 0:
-            depth = depth - 1
-        # recursively determine dependencies for these dependency modules, until depth is non-positive
-        moddeps = [dependencies_for(mod, modtool, depth=depth) for mod in mods]
+    signature = file_signature(mod_filepath)
+    cached = MODULE_DEPS_CACHE.get(mod_filepath)
+    if cached is None or signature is None or cached[0] != signature:
+        modtxt = read_file(mod_filepath)
+        cached = (signature, module_load_regex(mod_filepath).findall(modtxt))
+        MODULE_DEPS_CACHE[mod_filepath] = cached
     else:
-        # ignore any deeper dependencies
-        moddeps = []
+        _log.debug("Using cached list of dependencies for module file %s", mod_filepath)
+
+    return cached[1][:]
 
-    # add dependencies of dependency modules only if they're not there yet
-    for moddepdeps in moddeps:
-        for dep in moddepdeps:
-            if dep not in mods:
-                mods.append(dep)
 
-    return mods
+def dependencies_for(mod_name, modtool, depth=None):
+    """
+    Obtain a list of dependencies for the given module, determined recursively, up to a specified depth (optionally)
+    :param depth: recursion depth (default is None, which corresponds to infinite recursion depth)
+    """
+    # dependency graph is traversed depth-first, and the (partial) list of dependencies for each
+    # (module, depth) combination is only determined once, to avoid re-processing shared dependencies
+    # (compiler, MPI, ...) for every path through the graph in which they occur
+    graph = {}
+    deps_cache = {}
+
+    def direct_deps(name):
+        """Return list of direct dependencies for module with specified name."""
+        if name not in graph:
+            graph[name] = module_file_dependencies(modtool.modulefile_path(name))
+        return graph[name]
+
+    def collect_deps(name, depth):
+        """Determine list of dependencies for module with specified name, up to specified depth."""
+        key = (name, depth)
+        if key in deps_cache:
+            # (empty) placeholder is used for modules that are being processed, to deal with dependency cycles
+            return deps_cache[key] or []
+
+        deps_cache[key] = None
+        mods = direct_deps(name)[:]
+
+        if depth is None or depth > 0:
+            if depth and depth > 0:
+                depth = depth - 1
+            # add dependencies of dependency modules only if they're not there yet
+            for mod in mods[:]:
+                for dep in collect_deps(mod, depth):
+                    if dep not in mods:
+                        mods.append(dep)
+
+        deps_cache[key] = mods
+        return mods
+
+    return collect_deps(mod_name, depth)[:]
 
 
 class ModuleGenerator(object):
@@ -131,6 +131,10 @@ MODULE_SHOW_CACHE = {}
 # value: corresponding (validated) module version
 MODULE_VERSION_CACHE = {}
 
+# module paths in which module files were installed for which modules tool cache still needs to be updated
+# (one entry per installation, see ModulesTool.update)
+MODULES_TOOL_CACHE_PENDING_UPDATES = []
+
 
 _log = fancylogger.getLogger('modules', fname=False)
 
@@ -1034,10 +1038,16 @@ class ModulesTool(object):
             if os.path.exists(full_mod_path):
                 self.prepend_module_path(full_mod_path)
 
-        loaded_modules = self.loaded_modules()
-        for mod in modules:
-            if allow_reload or mod not in loaded_modules:
-                self.run_module('load', mod)
+        # only determine list of loaded modules when it's actually needed, since it requires running a module command
+        if not allow_reload:
+            loaded_modules = self.loaded_modules()
+            modules = [mod for mod in modules if mod not in loaded_modules]
+
+        # load modules in batches (or one by one, by default), to reduce number of times module command is run;
+        # modules are loaded in order by a single 'module load' command, so this is only a matter of performance
+        batch_size = max(build_option('module_load_batch_size', default=1) or 1, 1)
+        for idx in range(0, len(modules), batch_size):
+            self.run_module(['load'] + list(modules[idx:idx + batch_size]))
 
     def unload(self, modules=None):
         """
@@ -1526,8 +1536,70 @@ class ModulesTool(object):
         """
         raise NotImplementedError
 
-    def update(self):
-        """Update after new modules were added."""
+    def update(self, modpaths=None):
+        """
+        Update after new modules were added.
+
+        :param modpaths: list of module paths in which new module files were installed;
+                         if specified, the update of the modules tool cache is postponed until
+                         the number of pending installations reaches the batch size (or flush_updates is called)
+        """
+        if modpaths is None:
+            return self.update_cache()
+
+        if build_option('update_modules_tool_cache'):
+            MODULES_TOOL_CACHE_PENDING_UPDATES.append([normalize_path(p) for p in modpaths])
+            batch_size = build_option('update_modules_tool_cache_batch_size', default=0) or 0
+            self.log.debug("Modules tool cache update pending for %s (%d pending, batch size: %s)",
+                           modpaths, len(MODULES_TOOL_CACHE_PENDING_UPDATES), batch_size)
+            if batch_size > 0 and len(MODULES_TOOL_CACHE_PENDING_UPDATES) >= batch_size:
+                return self.flush_updates()
+
+    def flush_updates(self):
+        """
+        Perform pending update of modules tool cache (if any).
+
+        Only $MODULEPATH entries that are related to module paths in which new module files were installed
+        are taken into account; if there are none, the modules tool cache is left untouched.
+        """
+        if not MODULES_TOOL_CACHE_PENDING_UPDATES:
+            return None
+
+        changed_paths = nub(p for paths in MODULES_TOOL_CACHE_PENDING_UPDATES for p in paths)
+        install_cnt = len(MODULES_TOOL_CACHE_PENDING_UPDATES)
+        del MODULES_TOOL_CACHE_PENDING_UPDATES[:]
+
+        modpath_entries = self.modulepath_entries_for(changed_paths)
+        if modpath_entries:
+            self.log.info("Updating modules tool cache for %d installation(s), changed $MODULEPATH entries: %s",
+                          install_cnt, modpath_entries)
+            return self.update_cache(modpaths=modpath_entries)
+        else:
+            self.log.info("Not updating modules tool cache, none of %s is related to $MODULEPATH", changed_paths)
+            return None
+
+    def modulepath_entries_for(self, paths):
+        """
+        Determine which $MODULEPATH entries are affected by changes in the specified module paths,
+        i.e. entries which are located in, or are a parent directory of, any of the specified paths.
+
+        :param paths: list of (normalized) paths to directories in which module files were changed
+        """
+        res = []
+        for entry in curr_module_paths():
+            norm_entry = normalize_path(entry)
+            for path in paths:
+                if os.path.commonpath([norm_entry, path]) in (norm_entry, path):
+                    res.append(entry)
+                    break
+        return res
+
+    def update_cache(self, modpaths=None):
+        """
+        Update modules tool cache after new modules were added.
+
+        :param modpaths: list of $MODULEPATH entries to update cache for (if None, all entries are considered)
+        """
         raise NotImplementedError
 
 
@@ -1563,8 +1635,8 @@ class EnvironmentModulesC(ModulesTool):
 
         return super(EnvironmentModulesC, self).run_module(*args, **kwargs)
 
-    def update(self):
-        """Update after new modules were added."""
+    def update_cache(self, modpaths=None):
+        """Update modules tool cache after new modules were added."""
         pass
 
     def get_setenv_value_from_modulefile(self, mod_name, var_name):
@@ -1798,12 +1870,17 @@ class EnvironmentModules(ModulesTool):
         if set_mod_paths:
             self.set_mod_paths()
 
-    def update(self):
-        """Update after new modules were added."""
+    def update_cache(self, modpaths=None):
+        """
+        Update modules tool cache after new modules were added.
+
+        :param modpaths: list of $MODULEPATH entries to (re)build cache file for (if None, all entries are considered)
+        """
 
         version = LooseVersion(self.version)
         if build_option('update_modules_tool_cache') and version >= LooseVersion('5.3.0'):
-            out = self.run_module('cachebuild', return_stderr=True, check_output=False)
+            # 'module cachebuild' only (re)builds cache file for specified modulepath(s)
+            out = self.run_module(['cachebuild'] + (modpaths or []), return_stderr=True, check_output=False)
 
             if self.testing:
                 return out
@@ -1899,10 +1976,17 @@ class Lmod(ModulesTool):
 
         return correct_real_mods
 
-    def update(self):
-        """Update after new modules were added."""
+    def update_cache(self, modpaths=None):
+        """
+        Update local Lmod spider cache after new modules were added.
+
+        :param modpaths: list of $MODULEPATH entries that were changed (if None, all entries are considered);
+                         Lmod spider cache always covers the whole $MODULEPATH, so only used for logging
+        """
 
         if build_option('update_modules_tool_cache'):
+            if modpaths:
+                self.log.debug("Updating Lmod spider cache for changes in %s", modpaths)
             spider_cmd = os.path.join(os.path.dirname(self.cmd), 'spider')
             cmd_list = [spider_cmd, '-o', 'moduleT', os.environ['MODULEPATH']]
             cmd = ' '.join(cmd_list)
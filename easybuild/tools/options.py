@@ -68,7 +68,8 @@ from easybuild.tools.config import DEFAULT_ENV_FOR_SHEBANG, DEFAULT_ENVVAR_USERS
 from easybuild.tools.config import DEFAULT_FORCE_DOWNLOAD, DEFAULT_INDEX_MAX_AGE, DEFAULT_JOB_BACKEND
 from easybuild.tools.config import DEFAULT_JOB_EB_CMD, DEFAULT_LOGFILE_FORMAT, DEFAULT_MAX_FAIL_RATIO_PERMS
 from easybuild.tools.config import DEFAULT_MAX_PARALLEL, DEFAULT_MINIMAL_BUILD_ENV, DEFAULT_MNS
-from easybuild.tools.config import DEFAULT_MOD_SEARCH_PATH_HEADERS, DEFAULT_MODULE_SYNTAX, DEFAULT_MODULES_TOOL
+from easybuild.tools.config import DEFAULT_MOD_SEARCH_PATH_HEADERS, DEFAULT_MODULE_LOAD_BATCH_SIZE
+from easybuild.tools.config import DEFAULT_MODULE_SYNTAX, DEFAULT_MODULES_TOOL
 from easybuild.tools.config import DEFAULT_MODULECLASSES, DEFAULT_PATH_SUBDIRS, DEFAULT_PKG_RELEASE, DEFAULT_PKG_TOOL
 from easybuild.tools.config import DEFAULT_PKG_TYPE, DEFAULT_PNS, DEFAULT_PREFIX, DEFAULT_EXTRA_SOURCE_URLS
 from easybuild.tools.config import DEFAULT_REPOSITORY, DEFAULT_WAIT_ON_LOCK_INTERVAL, DEFAULT_WAIT_ON_LOCK_LIMIT
@@ -278,6 +279,9 @@ class EasyBuildOptions(GeneralOption):
             'extended-dry-run': ("Print build environment and (expected) build procedure that will be performed",
                                  None, 'store_true', False, 'x'),
             'extended-dry-run-ignore-errors': ("Ignore errors that occur during dry run", None, 'store_true', True),
+            'extended-dry-run-parallel': ("Number of easyconfigs to perform extended dry run for in parallel, "
+                                          "each in a separate worker process (output is printed in original order)",
+                                          'int', 'store', None),
             'force': ("Force to rebuild software even if it's already installed (i.e. if it can be found as module), "
                       "and skipping check for OS dependencies", None, 'store_true', False, 'f'),
             'ignore-locks': ("Ignore locks that prevent two identical installations running in parallel",
@@ -378,6 +382,13 @@ class EasyBuildOptions(GeneralOption):
             'banned-linked-shared-libs': ("Comma-separated list of shared libraries (names, file names, or paths) "
                                           "which are not allowed to be linked in any installed binary/library",
                                           'strlist', 'extend', None),
+            'cache-rpath-sanity-check': ("Cache results of RPATH sanity check in installation directory, "
+                                         "so only binaries/libraries that changed are checked again",
+                                         None, 'store_true', False),
+            'ccache-compress': ("Enable compression of compiler cache when --use-ccache is used",
+                                None, 'store_true', False),
+            'ccache-max-size': ("Maximum size of compiler cache when --use-ccache is used (e.g. 5G, 500M)",
+                                None, 'store', None),
             'check-ebroot-env-vars': ("Action to take when defined $EBROOT* environment variables are found "
                                       "for which there is no matching loaded module; "
                                       "supported values: %s" % ', '.join(EBROOT_ENV_VAR_ACTIONS), None, 'store', WARN),
@@ -485,6 +496,9 @@ class EasyBuildOptions(GeneralOption):
             'module-cache-suffix': ("Suffix to add to the cache file name (before the extension) "
                                     "when updating the modules tool cache",
                                     None, 'store', None),
+            'module-load-batch-size': ("Maximum number of modules to load via a single module command "
+                                       "(1 implies that modules are loaded one by one)",
+                                       'int', 'store', DEFAULT_MODULE_LOAD_BATCH_SIZE),
             'module-only': ("Only generate module file(s); skip all steps except for %s" % ', '.join(MODULE_ONLY_STEPS),
                             None, 'store_true', False),
             'modules-tool-version-check': ("Check version of modules tool being used", None, 'store_true', True),
@@ -504,6 +518,9 @@ class EasyBuildOptions(GeneralOption):
                          'int', 'store', None),
             'parallel-extensions-install': ("Install list of extensions in parallel (if supported)",
                                             None, 'store_true', False),
+            'parallel-sanity-check': ("Run sanity check commands (incl. those for extensions) in parallel, "
+                                      "each in a separate empty working directory",
+                                      None, 'store_true', False),
             'pre-create-installdir': ("Create installation directory before submitting build jobs",
                                       None, 'store_true', True),
             'prefer-python-search-path': (("Prefer using specified environment variable when possible to specify where"
@@ -549,11 +566,18 @@ class EasyBuildOptions(GeneralOption):
                                           None, 'store_true', False),
             'sysroot': ("Location root directory of system, prefix for standard paths like /usr/lib and /usr/include",
                         None, 'store', None),
+            'toolchain-registry-cache': ("Path to file used to cache registry of available toolchains, "
+                                         "so only the toolchain modules that are actually required are imported "
+                                         "(no caching if not specified)", None, 'store', None),
             'trace': ("Provide more information in output to stdout on progress", None, 'store_true', True, 'T'),
             'umask': ("umask to use (e.g. '022'); non-user write permissions on install directories are removed",
                       None, 'store', None),
             'update-modules-tool-cache': ("Update modules tool cache file(s) after generating module file",
                                           None, 'store_true', False),
+            'update-modules-tool-cache-batch-size': ("Number of installations after which modules tool cache is "
+                                                     "updated when --update-modules-tool-cache is used "
+                                                     "(0: only once at the end of the session)",
+                                                     'int', 'store', 0),
             'unit-testing-mode': ("Run in unit test mode", None, 'store_true', False),
             'use-ccache': ("Enable use of ccache to speed up compilation, with specified cache dir",
                            str, 'store', False, {'metavar': "PATH"}),
@@ -873,8 +897,12 @@ class EasyBuildOptions(GeneralOption):
         descr = ("Options for job backend", "Options for job backend (only relevant when --job is used)")
 
         opts = OrderedDict({
+            'array-jobs': ("Group independent jobs with identical resource requirements into array jobs "
+                           "(only supported for Slurm)", None, 'store_true', False),
             'backend-config': ("Configuration file for job backend", None, 'store', None),
             'cores': ("Number of cores to request per job", 'int', 'store', None),
+            'defer-fetch': ("Leave fetching sources to job itself if all sources/patches are already available",
+                            None, 'store_true', False),
             'deps-type': ("Type of dependency to set between jobs (default depends on job backend)",
                           'choice', 'store', None, [JOB_DEPS_TYPE_ABORT_ON_ERROR, JOB_DEPS_TYPE_ALWAYS_RUN]),
             'eb-cmd': ("EasyBuild command to use in jobs", 'str', 'store', DEFAULT_JOB_EB_CMD),
@@ -882,6 +910,8 @@ class EasyBuildOptions(GeneralOption):
             'max-walltime': ("Maximum walltime for jobs (in hours)", 'int', 'store', 24),
             'output-dir': ("Output directory for jobs (default: current directory)", None, 'store', get_cwd()),
             'polling-interval': ("Interval between polls for status of jobs (in seconds)", float, 'store', 30.0),
+            'prepare-threads': ("Number of threads to use to prepare easyconfigs (fetch sources) before submitting "
+                                "jobs (default: number of available cores)", 'int', 'store', None),
             'target-resource': ("Target resource for jobs", None, 'store', None),
         })
 
@@ -38,16 +38,18 @@ Authors:
 import math
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from easybuild.base import fancylogger
 from easybuild.framework.easyblock import get_easyblock_instance
-from easybuild.framework.easyconfig.easyconfig import ActiveMNS
+from easybuild.framework.easyconfig.easyconfig import ActiveMNS, letter_dir_for
 from easybuild.tools.build_log import EasyBuildError
-from easybuild.tools.config import build_option, get_repository, get_repositorypath
-from easybuild.tools.filetools import get_cwd
+from easybuild.tools.config import build_option, get_repository, get_repositorypath, source_paths
+from easybuild.tools.filetools import create_patch_info, get_cwd
 from easybuild.tools.module_naming_scheme.utilities import det_full_ec_version
 from easybuild.tools.job.backend import job_backend, JobBackend
 from easybuild.tools.repository.repository import init_repository
+from easybuild.tools.systemtools import det_parallelism
 
 
 _log = fancylogger.getLogger('parallelbuild', fname=False)
@@ -87,6 +89,12 @@ def build_easyconfigs_in_parallel(build_command, easyconfigs, output_dir='easybu
     except RuntimeError as err:
         raise EasyBuildError("connection to server failed (%s: %s), can't submit jobs.", err.__class__.__name__, err)
 
+    # this is very important, otherwise we might have race conditions
+    # e.g. GCC-4.5.3 finds cloog.tar.gz but it was incorrectly downloaded by GCC-4.6.3
+    # running this step here, prevents this
+    if prepare_first and not testing:
+        prepare_easyconfigs(easyconfigs)
+
     # dependencies have already been resolved,
     # so one can linearly walk over the list and use previous job id's
     jobs = []
@@ -95,12 +103,6 @@ def build_easyconfigs_in_parallel(build_command, easyconfigs, output_dir='easybu
     module_to_job = {}
 
     for easyconfig in easyconfigs:
-        # this is very important, otherwise we might have race conditions
-        # e.g. GCC-4.5.3 finds cloog.tar.gz but it was incorrectly downloaded by GCC-4.6.3
-        # running this step here, prevents this
-        if prepare_first and not testing:
-            prepare_easyconfig(easyconfig)
-
         # convert <tweaked easyconfig.eb> to <original-easyconfig.eb --try-xxx> to avoid needing a shared tmpdir
         spec = easyconfig['spec']
         if spec in (tweak_map or {}):
@@ -231,3 +233,94 @@ def prepare_easyconfig(ec):
         os.remove(easyblock_instance.logfile)
     except (OSError, EasyBuildError) as err:
         raise EasyBuildError("An error occurred while preparing %s: %s", ec, err)
+
+
+def sources_available(easyconfig):
+    """
+    Check whether all sources and patches for specified easyconfig are already available,
+    either in the source path or next to the easyconfig file (for patches).
+    Easyconfigs with extensions are never considered to have all sources available.
+
+    :param easyconfig: easyconfig as processed by process_easyconfig
+    """
+    ec = easyconfig['ec']
+    if ec['exts_list']:
+        return False
+
+    filenames = []
+    for source in ec['sources']:
+        if isinstance(source, dict):
+            filenames.append((source.get('filename'), None))
+        else:
+            filenames.append((source, None))
+
+    for patch_spec in ec['patches'] + ec['postinstallpatches']:
+        patch_info = create_patch_info(patch_spec)
+        filenames.append((patch_info['name'], patch_info.get('alt_location')))
+
+    paths = [os.path.dirname(easyconfig['spec'])] + source_paths()
+
+    for filename, alt_location in filenames:
+        if not filename:
+            return False
+        location = alt_location or ec['name']
+        candidates = []
+        for path in paths:
+            candidates.extend([
+                os.path.join(path, letter_dir_for(location), location, filename),
+                os.path.join(path, location, filename),
+                os.path.join(path, filename),
+            ])
+        if not any(os.path.isfile(cand) for cand in candidates):
+            _log.debug("%s not found for %s, so not all sources are available", filename, easyconfig['spec'])
+            return False
+
+    return True
+
+
+def prepare_easyconfigs(easyconfigs, max_workers=None):
+    """
+    Prepare for building specified easyconfigs (fetch sources), using a bounded pool of threads.
+
+    Easyconfigs for the same software are prepared in the same thread (in order),
+    to avoid that sources shared between them are downloaded concurrently.
+
+    :param easyconfigs: list of easyconfigs as processed by process_easyconfig
+    :param max_workers: maximum number of threads to use (default: --job-prepare-threads, or available cores)
+    """
+    if build_option('job_defer_fetch'):
+        to_prepare = []
+        for easyconfig in easyconfigs:
+            if sources_available(easyconfig):
+                _log.info("All sources for %s are available, leaving fetch step to job", easyconfig['spec'])
+            else:
+                to_prepare.append(easyconfig)
+    else:
+        to_prepare = easyconfigs
+
+    groups = {}
+    for easyconfig in to_prepare:
+        groups.setdefault(easyconfig['ec'].name, []).append(easyconfig)
+
+    if not groups:
+        return
+
+    if max_workers is None:
+        max_workers = build_option('job_prepare_threads') or det_parallelism()
+    max_workers = max(1, min(max_workers, len(groups)))
+
+    _log.info("Preparing %d easyconfigs using %d threads", len(to_prepare), max_workers)
+
+    def prepare_group(group):
+        """Prepare list of easyconfigs, one after the other."""
+        for easyconfig in group:
+            prepare_easyconfig(easyconfig)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(prepare_group, group) for group in groups.values()]
+        # make sure all preparations are done before reporting the first problem (if any)
+        errors = [fut.exception() for fut in futures]
+
+    for err in errors:
+        if err is not None:
+            raise err
@@ -36,6 +36,7 @@ import ctypes
 import errno
 import fcntl
 import grp  # @UnresolvedImport
+import importlib.util
 import io
 import os
 import platform
@@ -50,12 +51,10 @@ from ctypes.util import find_library
 from socket import gethostname
 
 # pkg_resources is provided by the setuptools Python package,
-# which we really want to keep as an *optional* dependency
-try:
-    import pkg_resources
-    HAVE_PKG_RESOURCES = True
-except ImportError:
-    HAVE_PKG_RESOURCES = False
+# which we really want to keep as an *optional* dependency;
+# importing it is quite expensive, so we only check whether it is available here,
+# and only import it when it's actually needed (see det_pypkg_version)
+HAVE_PKG_RESOURCES = importlib.util.find_spec('pkg_resources') is not None
 
 try:
     # only needed on macOS, may not be available on Linux
@@ -1363,6 +1362,8 @@ def det_pypkg_version(pkg_name, imported_pkg, import_name=None):
     version = None
 
     if HAVE_PKG_RESOURCES:
+        import pkg_resources
+
         if import_name:
             try:
                 version = pkg_resources.get_distribution(import_name).version
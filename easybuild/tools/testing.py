@@ -50,7 +50,6 @@ from easybuild.tools.config import build_option
 from easybuild.tools.filetools import find_easyconfigs, get_cwd, mkdir, read_file, write_file
 from easybuild.tools.github import GITHUB_EASYBLOCKS_REPO, GITHUB_EASYCONFIGS_REPO, create_gist, post_comment_in_issue
 from easybuild.tools.jenkins import aggregate_xml_in_dirs
-from easybuild.tools.parallelbuild import build_easyconfigs_in_parallel
 from easybuild.tools.robot import resolve_dependencies
 from easybuild.tools.systemtools import UNKNOWN, get_gpu_info, get_system_info
 from easybuild.tools.version import FRAMEWORK_VERSION, EASYBLOCKS_VERSION
@@ -124,6 +123,8 @@ def regtest(easyconfig_paths, modtool, build_specs=None):
         # retry twice in case of failure, to avoid fluke errors
         command += "if [ $? -ne 0 ]; then %(cmd)s --force && %(cmd)s --force; fi" % {'cmd': cmd}
 
+        # only import support for submitting jobs when it's actually needed
+        from easybuild.tools.parallelbuild import build_easyconfigs_in_parallel
         build_easyconfigs_in_parallel(command, resolved, output_dir=output_dir)
 
         _log.info("Submitted regression test as jobs, results in %s" % output_dir)
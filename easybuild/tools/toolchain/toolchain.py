@@ -57,15 +57,17 @@ import os
 import stat
 import sys
 import tempfile
+import time
 
 from easybuild.base import fancylogger
 from easybuild.tools.build_log import EasyBuildError, dry_run_msg, print_warning
-from easybuild.tools.config import build_option, install_path
+from easybuild.tools.config import build_option, build_path, install_path
 from easybuild.tools.environment import setvar
 from easybuild.tools.filetools import adjust_permissions, find_eb_script, read_file, which, write_file
 from easybuild.tools.module_generator import dependencies_for
 from easybuild.tools.modules import get_software_root, get_software_root_env_var_name
 from easybuild.tools.modules import get_software_version, get_software_version_env_var_name
+from easybuild.tools.run import run_shell_cmd
 from easybuild.tools.systemtools import LINUX, get_os_type
 from easybuild.tools.toolchain.options import ToolchainOptions
 from easybuild.tools.toolchain.toolchainvariables import ToolchainVariables
@@ -201,6 +203,8 @@ class Toolchain(object):
         self.dependencies = []
         self.toolchain_dep_mods = []
         self.cached_compilers = set()
+        # timestamp and ccache statistics when compiler cache was prepared
+        self.comp_cache_start = None
 
         if name is None:
             name = self.NAME
@@ -950,8 +954,9 @@ class Toolchain(object):
         compilers = self.comp_cache_compilers(cache_tool)
         self.log.debug("Using compiler cache tool '%s' for compilers: %s", cache_tool, compilers)
 
-        # set paths that should be used by compiler caching tool
-        comp_cache_path = build_option('use_%s' % cache_tool)
+        # set paths that should be used by compiler caching tool;
+        # use a subdirectory per toolchain, which doesn't depend on the installation prefix
+        comp_cache_path = os.path.join(build_option('use_%s' % cache_tool), self.comp_cache_namespace())
         setvar('%s_DIR' % cache_tool.upper(), comp_cache_path)
         setvar('%s_TEMPDIR' % cache_tool.upper(), tempfile.mkdtemp())
 
@@ -964,6 +969,100 @@ class Toolchain(object):
         self.cached_compilers.update(compilers)
         self.log.debug("Cached compilers (after preparing for %s): %s", cache_tool, self.cached_compilers)
 
+        if cache_tool == CCACHE:
+            self.configure_ccache()
+            # only collect statistics once, toolchain may be prepared multiple times (iterated builds, extensions)
+            if self.comp_cache_start is None and not self.dry_run:
+                self.comp_cache_start = (time.time(), self.comp_cache_stats(cache_path))
+
+    def comp_cache_namespace(self):
+        """
+        Determine namespace (subdirectory) to use in compiler cache directory,
+        which should only depend on the toolchain (not on installation prefix, build directory, ...).
+        """
+        return '%s-%s' % (self.name, self.version)
+
+    def configure_ccache(self):
+        """
+        Configure ccache: size limit and compression of cache,
+        and settings to avoid that location of build/installation directories affects cache hits.
+        """
+        # absolute paths in base directory are rewritten to relative paths before hashing,
+        # so rebuilding in a different build directory or with a different installation prefix can hit the cache;
+        # base directory '/' is not allowed by ccache
+        base_dir = os.path.commonpath([build_path(), install_path()])
+        if base_dir != os.path.sep:
+            setvar('CCACHE_BASEDIR', base_dir)
+
+        # don't include current working directory in hash (only relevant when debug info is generated)
+        setvar('CCACHE_NOHASHDIR', '1')
+
+        max_size = build_option('ccache_max_size')
+        if max_size:
+            setvar('CCACHE_MAXSIZE', max_size)
+
+        if build_option('ccache_compress'):
+            setvar('CCACHE_COMPRESS', '1')
+
+    def comp_cache_stats(self, cache_cmd=CCACHE):
+        """
+        Collect ccache statistics (counters), via 'ccache --print-stats'.
+
+        :param cache_cmd: (path to) ccache command
+        :return: dict with statistics (empty if statistics could not be obtained)
+        """
+        stats = {}
+        res = run_shell_cmd("%s --print-stats" % cache_cmd, fail_on_error=False, hidden=True, output_file=False)
+        if res.exit_code == 0:
+            for line in res.output.splitlines():
+                key, _, value = line.strip().partition('\t')
+                if value.isdigit():
+                    stats[key] = int(value)
+
+        if not stats:
+            self.log.info("No statistics available for %s, output of '%s --print-stats': %s",
+                          CCACHE, cache_cmd, res.output)
+
+        return stats
+
+    def comp_cache_report(self):
+        """
+        Report on effectiveness of compiler cache since it was prepared for this toolchain:
+        number of cache hits and misses, hit rate, and estimated time saved.
+
+        :return: dict with results, or None if no statistics are available
+        """
+        if self.comp_cache_start is None:
+            return None
+
+        start_time, start_stats = self.comp_cache_start
+        stats = self.comp_cache_stats(which(CCACHE) or CCACHE) if start_stats else None
+        if not stats:
+            return None
+
+        def delta(*keys):
+            """Determine increase of sum of specified counters."""
+            return sum(stats.get(key, 0) - start_stats.get(key, 0) for key in keys)
+
+        hits = delta('direct_cache_hit', 'preprocessed_cache_hit')
+        misses = delta('cache_miss')
+
+        report = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(100.0 * hits / (hits + misses), 1) if hits + misses else None,
+            'estimated_time_saved': None,
+        }
+        # time spent on cache misses is (generously) estimated as total time elapsed since cache was prepared,
+        # each cache hit is assumed to save the average time spent per cache miss
+        if misses:
+            report['estimated_time_saved'] = round(hits * (time.time() - start_time) / misses, 2)
+
+        self.log.info("Compiler cache (%s) statistics: %d hits, %d misses, hit rate: %s%%, estimated time saved: %ss",
+                      CCACHE, hits, misses, report['hit_rate'], report['estimated_time_saved'])
+
+        return report
+
     @staticmethod
     def is_rpath_wrapper(path):
         """
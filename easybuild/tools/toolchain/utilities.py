@@ -27,6 +27,7 @@ Toolchain utility module
 
 Easy access to actual Toolchain classes
     search_toolchain
+    toolchain_registry
 
 Based on VSC-tools vsc.mympirun.mpi.mpi and vsc.mympirun.rm.sched
 
@@ -36,26 +37,174 @@ Authors:
 * Kenneth Hoste (Ghent University)
 """
 import copy
+import glob
+import json
+import os
 import re
 import sys
 
 import easybuild.tools.toolchain
 from easybuild.base import fancylogger
 from easybuild.tools.build_log import EasyBuildError
+from easybuild.tools.config import build_option
+from easybuild.tools.filetools import file_signature, read_file, write_file
 from easybuild.tools.toolchain.toolchain import Toolchain
-from easybuild.tools.utilities import get_subclasses, import_available_modules, nub
+from easybuild.tools.utilities import get_class_for, get_subclasses, import_available_modules, nub
+from easybuild.tools.version import FRAMEWORK_VERSION
 
 
 TC_CONST_PREFIX = 'TC_CONSTANT_'
 
+# (sub)packages in which toolchain modules and toolchain components are located
+TOOLCHAIN_PKGS = ['easybuild.toolchains'] + ['easybuild.toolchains.' + x for x in ('compiler', 'fft', 'linalg', 'mpi')]
+
+TOOLCHAIN_REGISTRY_FORMAT_VERSION = 1
+
 _initial_toolchain_instances = {}
 
+# registry of available toolchains, see toolchain_registry()
+_toolchain_registry = None
+
 _log = fancylogger.getLogger("toolchain.utilities")
 
 
+def _toolchain_module_signatures():
+    """
+    Determine signatures for all Python modules that (may) provide toolchains or toolchain components,
+    which is used to check whether a cached toolchain registry is still up-to-date.
+    """
+    signatures = []
+    for path in sys.path:
+        for pkg in TOOLCHAIN_PKGS:
+            mod_glob = os.path.join(path or os.getcwd(), *pkg.split('.'), '*.py')
+            for mod_path in sorted(glob.glob(mod_glob)):
+                signatures.append([mod_path, file_signature(mod_path)])
+
+    # results of json.load are lists rather than tuples, so stick to lists to make comparison easy
+    return json.loads(json.dumps(signatures))
+
+
+def _load_toolchain_registry():
+    """
+    Load toolchain registry from cache file specified via --toolchain-registry-cache (if any).
+
+    :return: toolchain registry, or None if no (up-to-date) cached registry is available
+    """
+    registry = None
+
+    cache_path = build_option('toolchain_registry_cache', default=None)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            registry = json.loads(read_file(cache_path))
+        except (EasyBuildError, ValueError) as err:
+            _log.warning("Failed to load cached toolchain registry from %s: %s", cache_path, err)
+            return None
+
+        if not isinstance(registry, dict) or registry.get('format_version') != TOOLCHAIN_REGISTRY_FORMAT_VERSION:
+            _log.info("Ignoring cached toolchain registry in %s, since it has an unknown format", cache_path)
+            registry = None
+        elif registry.get('framework_version') != str(FRAMEWORK_VERSION):
+            _log.info("Ignoring cached toolchain registry in %s, since it was created by another EasyBuild version",
+                      cache_path)
+            registry = None
+        elif registry.get('signatures') != _toolchain_module_signatures():
+            _log.info("Ignoring cached toolchain registry in %s, since toolchain modules have changed", cache_path)
+            registry = None
+        else:
+            for tc_metadata in registry['toolchains'].values():
+                # alternative subtoolchains are specified as a tuple, which are turned into lists by JSON
+                subtc = tc_metadata['subtoolchain']
+                if isinstance(subtc, list):
+                    tc_metadata['subtoolchain'] = [tuple(x) if isinstance(x, list) else x for x in subtc]
+            registry['cached'] = True
+            _log.info("Loaded cached toolchain registry from %s", cache_path)
+
+    return registry
+
+
+def _save_toolchain_registry(registry):
+    """
+    Save toolchain registry to cache file specified via --toolchain-registry-cache (if any).
+    Failing to save the toolchain registry is not considered to be fatal.
+    """
+    cache_path = build_option('toolchain_registry_cache', default=None)
+    if cache_path:
+        registry = {key: registry[key] for key in ('constants', 'toolchains')}
+        registry.update({
+            'format_version': TOOLCHAIN_REGISTRY_FORMAT_VERSION,
+            'framework_version': str(FRAMEWORK_VERSION),
+            'signatures': _toolchain_module_signatures(),
+        })
+        try:
+            write_file(cache_path, json.dumps(registry, indent=4, sort_keys=True))
+            _log.info("Toolchain registry saved to %s", cache_path)
+        except EasyBuildError as err:
+            _log.warning("Failed to save toolchain registry to %s: %s", cache_path, err)
+
+
+def _set_toolchain_constants(tc_consts):
+    """
+    Make specified toolchain constants available in toolchain module.
+
+    :param tc_consts: dict with names and values of toolchain constants
+    """
+    package = easybuild.tools.toolchain
+    for tc_const_name, tc_const_value in sorted(tc_consts.items()):
+        try:
+            cur_value = getattr(package, tc_const_name)
+        except AttributeError:
+            setattr(package, tc_const_name, tc_const_value)
+        else:
+            if not tc_const_value == cur_value:
+                raise EasyBuildError("Constant %s.%s defined as '%s', can't set it to '%s'.",
+                                     package.__name__, tc_const_name, cur_value, tc_const_value)
+
+
+def toolchain_registry():
+    """
+    Return registry of available toolchains, which specifies for each toolchain (by name):
+    class name, name of Python module in which it is defined, subtoolchain(s), whether it is optional,
+    and whether it is a composite toolchain (i.e. composed from multiple toolchain components).
+
+    If no cached toolchain registry is available (see --toolchain-registry-cache),
+    this implies importing all available toolchain modules (only once per session).
+    """
+    registry = _get_toolchain_registry()
+    if registry is None:
+        # search_toolchain imports all toolchain modules, and (re)creates the toolchain registry
+        search_toolchain('')
+    else:
+        _use_toolchain_registry(registry)
+
+    return _toolchain_registry['toolchains']
+
+
+def _get_toolchain_registry():
+    """Return toolchain registry that is currently in use (if it's still valid), or load it from cache file."""
+    processed = getattr(easybuild.tools.toolchain, '%s_PROCESSED' % TC_CONST_PREFIX, None)
+    # toolchain registry that was created after importing all toolchain modules is only valid
+    # as long as toolchain modules don't have to be processed again (for example after including extra toolchains)
+    if _toolchain_registry and (processed or _toolchain_registry.get('cached')):
+        return _toolchain_registry
+    return _load_toolchain_registry()
+
+
+def _use_toolchain_registry(registry):
+    """Use specified toolchain registry (and define corresponding toolchain constants)."""
+    global _toolchain_registry
+
+    _set_toolchain_constants(registry['constants'])
+    _toolchain_registry = registry
+
+
 def search_toolchain(name):
     """
     Obtain a Toolchain instance for the toolchain with specified name, next to a list of available toolchains.
+
+    If the specified toolchain is known via the toolchain registry (see toolchain_registry),
+    only the Python module in which it is defined is imported (rather than all toolchain modules),
+    in which case the list of available toolchains only includes the toolchains that have been imported.
+
     :param name: toolchain name
     :return: Toolchain instance (or None), found_toolchains
     """
@@ -63,7 +212,21 @@ def search_toolchain(name):
     package = easybuild.tools.toolchain
     check_attr_name = '%s_PROCESSED' % TC_CONST_PREFIX
 
-    if not getattr(package, check_attr_name, None):
+    processed = getattr(package, check_attr_name, None)
+
+    if name and not processed:
+        registry = _get_toolchain_registry()
+        if registry and name in registry['toolchains']:
+            _use_toolchain_registry(registry)
+            tc_metadata = registry['toolchains'][name]
+            _log.debug("Importing %s toolchain from %s (via toolchain registry)", name, tc_metadata['module'])
+            tc_class = get_class_for(tc_metadata['module'], tc_metadata['class'])
+            found_tcs = [tc for tc in nub(get_subclasses(Toolchain)) if tc._is_toolchain_for(None)]
+            return tc_class, found_tcs
+
+    if not processed:
+        tc_consts = {}
+
         # import all available toolchains, so we know about them
         tc_modules = import_available_modules('easybuild.toolchains')
 
@@ -89,18 +252,13 @@ def search_toolchain(name):
                         tc_const_value = getattr(mod_class_mod, elem)
                         _log.debug("Found constant %s ('%s') in module %s, adding it to %s",
                                    tc_const_name, tc_const_value, mod_class_mod.__name__, package.__name__)
-                        try:
-                            cur_value = getattr(package, tc_const_name)
-                        except AttributeError:
-                            setattr(package, tc_const_name, tc_const_value)
-                        else:
-                            if not tc_const_value == cur_value:
-                                raise EasyBuildError("Constant %s.%s defined as '%s', can't set it to '%s'.",
-                                                     package.__name__, tc_const_name, cur_value, tc_const_value)
+                        _set_toolchain_constants({tc_const_name: tc_const_value})
+                        tc_consts[tc_const_name] = tc_const_value
 
         # indicate that processing of toolchain constants is done, so it's not done again
         setattr(package, check_attr_name, True)
     else:
+        tc_consts = None
         _log.debug("Skipping importing of toolchain modules, processing of toolchain constants is already done.")
 
     # obtain all subclasses of toolchain
@@ -109,6 +267,24 @@ def search_toolchain(name):
     # filter found toolchain subclasses based on whether they can be used a toolchains
     found_tcs = [tc for tc in found_tcs if tc._is_toolchain_for(None)]
 
+    # (re)create toolchain registry after importing all toolchain modules
+    if tc_consts is not None:
+        registry = {
+            'constants': tc_consts,
+            'toolchains': {},
+        }
+        for tc in found_tcs:
+            # first toolchain class found for a particular toolchain name wins, like below
+            registry['toolchains'].setdefault(tc.NAME, {
+                'class': tc.__name__,
+                'composite': len(tc.__bases__) > 1,
+                'module': tc.__module__,
+                'optional': getattr(tc, 'OPTIONAL', False),
+                'subtoolchain': getattr(tc, 'SUBTOOLCHAIN', None),
+            })
+        _use_toolchain_registry(registry)
+        _save_toolchain_registry(registry)
+
     for tc in found_tcs:
         if tc._is_toolchain_for(name):
             return tc, found_tcs
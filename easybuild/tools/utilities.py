@@ -30,6 +30,7 @@ Authors:
 * Kenneth Hoste (Ghent University)
 """
 import datetime
+import functools
 import glob
 import os
 import re
@@ -168,23 +169,18 @@ def only_if_module_is_available(modnames, pkgname=None, url=None):
 
     def wrap(orig):
         """Decorated function, raises ImportError if specified module is not available."""
-        try:
-            imported = None
+
+        # availability of required module is only checked when decorated function is called,
+        # to avoid that importing of (potentially heavy) optional modules slows down importing of EasyBuild modules
+        @functools.wraps(orig)
+        def wrapped(*args, **kwargs):
             for modname in modnames:
                 try:
                     __import__(modname)
-                    imported = modname
                     break
                 except ImportError:
                     pass
-
-            if imported is None:
-                raise ImportError
             else:
-                return orig
-
-        except ImportError:
-            def error(*args, **kwargs):
                 msg = "None of the specified modules (%s) is available" % ', '.join(modnames)
                 if pkgname:
                     msg += " (provided by Python package %s, available from %s)" % (pkgname, url)
@@ -192,7 +188,10 @@ def only_if_module_is_available(modnames, pkgname=None, url=None):
                     msg += " (available from %s)" % url
                 msg += ", yet one of them is required!"
                 raise EasyBuildError("ImportError: %s", msg)
-            return error
+
+            return orig(*args, **kwargs)
+
+        return wrapped
 
     return wrap
 
@@ -1037,6 +1037,29 @@ class FileToolsTest(EnhancedTestCase):
         self.assertTrue(ft.is_binary(b"File is binary when it includes \00 somewhere"))
         self.assertTrue(ft.is_binary(ft.read_file('/bin/bash', mode='rb')))
 
+    def test_file_signature(self):
+        """Test file_signature function."""
+
+        test_file = os.path.join(self.test_prefix, 'test.txt')
+        self.assertEqual(ft.file_signature(test_file), None)
+
+        ft.write_file(test_file, 'foo')
+        sig = ft.file_signature(test_file)
+        self.assertEqual(sig, (os.stat(test_file).st_ino, os.stat(test_file).st_mtime_ns, 3))
+        self.assertEqual(ft.file_signature(test_file), sig)
+
+        # signature of symlink is signature of file it points to
+        test_symlink = os.path.join(self.test_prefix, 'test_symlink.txt')
+        ft.symlink(test_file, test_symlink)
+        self.assertEqual(ft.file_signature(test_symlink), sig)
+
+        # signature changes when file is modified, or when only its modification time is updated
+        ft.write_file(test_file, 'foobar')
+        new_sig = ft.file_signature(test_file)
+        self.assertEqual(new_sig[2], 6)
+        os.utime(test_file, ns=(0, new_sig[1] + 10**9))
+        self.assertNotEqual(ft.file_signature(test_file), new_sig)
+
     def test_det_patched_files(self):
         """Test det_patched_files function."""
         toy_patch_fn = 'toy-0.0_fix-silly-typo-in-printf-statement.patch'
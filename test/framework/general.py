@@ -37,6 +37,7 @@ import easybuild.framework
 import easybuild.tools.repository.filerepo
 from easybuild.tools.build_log import EasyBuildError
 from easybuild.tools.filetools import change_dir, mkdir, read_file, write_file
+from easybuild.tools.run import run_shell_cmd
 from easybuild.tools.utilities import import_available_modules, only_if_module_is_available
 
 
@@ -154,6 +155,24 @@ class GeneralTest(EnhancedTestCase):
         import test123.three
         self.assertEqual([test123.one, test123.three, test123.two], res)
 
+    def test_lazy_imports(self):
+        """Check that (potentially heavy) modules that are only needed in specific cases are not imported at startup."""
+        lazy_modules = [
+            'easybuild.framework.easystack',
+            'easybuild.tools.containers.common',
+            'easybuild.tools.parallelbuild',
+            'pkg_resources',
+            'pycodestyle',
+            'yaml',
+        ]
+        # use a separate Python process, since these modules may have been imported already by other tests
+        pycode = "import sys; import easybuild.main; "
+        pycode += "print('imported: ' + ','.join(m for m in %s if m in sys.modules))" % lazy_modules
+        cmd = "PYTHONPATH=%s %s -c \"%s\"" % (os.pathsep.join(sys.path), sys.executable, pycode)
+        res = run_shell_cmd(cmd, hidden=True)
+        self.assertEqual(res.exit_code, 0)
+        self.assertEqual(res.output.strip().splitlines()[-1], 'imported:')
+
 
 def suite():
     """ returns all the testcases in this module """
@@ -36,7 +36,7 @@ import tempfile
 from unittest import TextTestRunner, TestSuite
 
 from easybuild.framework.easyconfig.tools import process_easyconfig
-from easybuild.tools import LooseVersion, config
+from easybuild.tools import LooseVersion, config, module_generator
 from easybuild.tools.filetools import mkdir, read_file, remove_file, write_file
 from easybuild.tools.module_generator import ModuleGeneratorLua, ModuleGeneratorTcl, dependencies_for
 from easybuild.tools.module_naming_scheme.utilities import is_valid_module_name
@@ -1616,6 +1616,55 @@ class ModuleGeneratorTest(EnhancedTestCase):
             ]
             self.assertEqual(dependencies_for('test/1.2.3', self.modtool), expected)
 
+    def test_dependencies_for_diamonds(self):
+        """Test dependencies_for function on module tree with deep diamond-shaped dependency graph."""
+        # each module at level N depends on both modules at level N+1,
+        # so there are 2^N paths through the dependency graph to modules at level N
+        depth = 12
+        for level in range(depth):
+            for name in ('a', 'b'):
+                modtxt = ['#%Module']
+                if level < depth - 1:
+                    modtxt.extend('module load %s%d/1.0' % (dep, level + 1) for dep in ('a', 'b'))
+                write_file(os.path.join(self.test_prefix, '%s%d' % (name, level), '1.0'), '\n'.join(modtxt))
+        self.modtool.use(self.test_prefix)
+
+        module_generator.MODULE_DEPS_CACHE.clear()
+        orig_read_file = module_generator.read_file
+        read_files = []
+
+        def mocked_read_file(path, *args, **kwargs):
+            read_files.append(path)
+            return orig_read_file(path, *args, **kwargs)
+
+        module_generator.read_file = mocked_read_file
+        try:
+            res = dependencies_for('a0/1.0', self.modtool)
+            expected = ['a1/1.0', 'b1/1.0'] + ['%s%d/1.0' % (n, lvl) for lvl in range(2, depth) for n in ('a', 'b')]
+            self.assertEqual(res, expected)
+            # each module file is only read once
+            self.assertEqual(len(read_files), 2 * depth - 1)
+            self.assertEqual(len(set(read_files)), len(read_files))
+
+            self.assertEqual(dependencies_for('a0/1.0', self.modtool, depth=1), expected[:4])
+
+            # module files are not read again, unless they were changed
+            b1_modfile = os.path.join(self.test_prefix, 'b1', '1.0')
+            write_file(b1_modfile, '\n'.join(['#%Module', 'module load b2/1.0', 'module load extra/1.0']))
+            os.utime(b1_modfile, (0, 0))
+            write_file(os.path.join(self.test_prefix, 'extra', '1.0'), '#%Module')
+            read_files[:] = []
+            res = dependencies_for('a0/1.0', self.modtool, depth=1)
+            self.assertEqual(res, expected[:4] + ['extra/1.0'])
+            self.assertEqual(sorted(os.path.basename(os.path.dirname(p)) for p in read_files), ['b1'])
+        finally:
+            module_generator.read_file = orig_read_file
+
+        # dependency cycles are handled
+        write_file(os.path.join(self.test_prefix, 'cycle1', '1.0'), '#%Module\nmodule load cycle2/1.0')
+        write_file(os.path.join(self.test_prefix, 'cycle2', '1.0'), '#%Module\nmodule load cycle1/1.0')
+        self.assertEqual(dependencies_for('cycle1/1.0', self.modtool), ['cycle2/1.0', 'cycle1/1.0'])
+
     def test_det_installdir(self):
         """Test det_installdir method."""
 
@@ -480,6 +480,46 @@ class ModulesTest(EnhancedTestCase):
         self.assertEqual(os.environ.get('EBROOTGCC'), None)
         self.assertNotEqual(loaded_modules[-1], 'GCC/6.4.0-2.28')
 
+    def test_load_batch(self):
+        """Test loading of modules in batches, via --module-load-batch-size."""
+        self.init_testmods()
+
+        mods = ['GCC/6.4.0-2.28', 'OpenMPI/2.1.2-GCC-6.4.0-2.28', 'OpenBLAS/0.2.20-GCC-6.4.0-2.28']
+
+        module_cmds = []
+        orig_run_module = self.modtool.run_module
+
+        def run_module_track_cmds(*args, **kwargs):
+            """Keep track of module commands being run."""
+            module_cmds.append(' '.join(args[0] if isinstance(args[0], (list, tuple)) else args))
+            return orig_run_module(*args, **kwargs)
+
+        self.modtool.run_module = run_module_track_cmds
+
+        # by default, modules are loaded one by one
+        self.modtool.load(mods)
+        self.assertEqual(module_cmds, ['load ' + m for m in mods])
+        self.assertEqual([m for m in self.modtool.loaded_modules() if m in mods], mods)
+        self.modtool.purge()
+
+        for batch_size, expected_cmds in [
+            (2, ['load GCC/6.4.0-2.28 OpenMPI/2.1.2-GCC-6.4.0-2.28', 'load OpenBLAS/0.2.20-GCC-6.4.0-2.28']),
+            (10, ['load ' + ' '.join(mods)]),
+        ]:
+            init_config(build_options={'module_load_batch_size': batch_size})
+            module_cmds[:] = []
+            self.modtool.load(mods)
+            self.assertEqual(module_cmds, expected_cmds)
+            self.assertEqual([m for m in self.modtool.loaded_modules() if m in mods], mods)
+            self.assertTrue(os.environ.get('EBROOTOPENBLAS'))
+            self.modtool.purge()
+
+        # already loaded modules are filtered out when reloading is not allowed
+        self.modtool.load(['GCC/6.4.0-2.28'])
+        module_cmds[:] = []
+        self.modtool.load(mods, allow_reload=False)
+        self.assertEqual(module_cmds, ['list', 'load OpenMPI/2.1.2-GCC-6.4.0-2.28 OpenBLAS/0.2.20-GCC-6.4.0-2.28'])
+
     def test_show(self):
         """Test for ModulesTool.show method."""
 
@@ -192,6 +192,92 @@ class ModulesToolTest(EnhancedTestCase):
             # test updating local spider cache (but don't actually update the local cache file!)
             self.assertTrue(lmod.update(), "Updated local Lmod spider cache is non-empty")
 
+    def test_lmod_update_cache_postponed(self):
+        """Test postponed (batched) update of Lmod spider cache, using fake 'lmod' and 'spider' commands."""
+        modules.MODULES_TOOL_CACHE_PENDING_UPDATES[:] = []
+
+        fake_bin = os.path.join(self.test_prefix, 'fake_lmod', 'libexec')
+        fake_lmod = os.path.join(fake_bin, 'lmod')
+        write_file(fake_lmod, '\n'.join([
+            '#!/bin/bash',
+            'echo "Modules based on Lua: Version %s " >&2' % Lmod.REQ_VERSION,
+            'echo "os.environ[\'FOO\'] = \'foo\'"',
+        ]))
+        # fake 'spider' command that keeps track of how it was run, and prints fake spider cache contents
+        spider_log = os.path.join(self.test_prefix, 'spider.log')
+        fake_spider = os.path.join(fake_bin, 'spider')
+        write_file(fake_spider, '\n'.join([
+            '#!/bin/bash',
+            'echo "$@" >> %s' % spider_log,
+            'echo "spiderT = {}"',
+        ]))
+        for path in (fake_lmod, fake_spider):
+            os.chmod(path, stat.S_IRUSR | stat.S_IXUSR)
+        os.environ['LMOD_CMD'] = fake_lmod
+
+        # module tree (fixture), with one entry in $MODULEPATH per module class
+        modtree = os.path.join(self.test_prefix, 'modules')
+        modpath_all = os.path.join(modtree, 'all')
+        modpath_tools = os.path.join(modtree, 'tools')
+        for path in (modpath_all, modpath_tools):
+            write_file(os.path.join(path, 'test', '1.0.lua'), 'help([[test]])')
+        os.environ['MODULEPATH'] = os.pathsep.join([modpath_all, modpath_tools])
+
+        def spider_runs():
+            """Return list of arguments for each run of fake 'spider' command."""
+            if os.path.exists(spider_log):
+                return read_file(spider_log).strip().split('\n')
+            return []
+
+        build_options = {
+            'allow_modules_tool_mismatch': True,
+            'update_modules_tool_cache': True,
+        }
+        init_config(build_options=build_options)
+        lmod = Lmod(testing=True)
+
+        # by default, update of cache is postponed until flush_updates is called, and done only once
+        for _ in range(3):
+            self.assertEqual(lmod.update(modpaths=[modpath_all, modpath_tools]), None)
+        self.assertEqual(spider_runs(), [])
+        self.assertEqual(len(modules.MODULES_TOOL_CACHE_PENDING_UPDATES), 3)
+
+        self.assertEqual(lmod.flush_updates(), 'spiderT = {}\n')
+        self.assertEqual(spider_runs(), ['-o moduleT ' + os.environ['MODULEPATH']])
+        self.assertEqual(modules.MODULES_TOOL_CACHE_PENDING_UPDATES, [])
+
+        # nothing to do if there are no pending updates
+        self.assertEqual(lmod.flush_updates(), None)
+        self.assertEqual(len(spider_runs()), 1)
+
+        # changes to module paths that are not related to $MODULEPATH do not trigger an update of the cache
+        other_modpath = os.path.join(self.test_prefix, 'other', 'modules', 'all')
+        write_file(os.path.join(other_modpath, 'test', '1.0.lua'), 'help([[test]])')
+        lmod.update(modpaths=[other_modpath])
+        self.assertEqual(lmod.flush_updates(), None)
+        self.assertEqual(len(spider_runs()), 1)
+
+        # changes in parent directory of a $MODULEPATH entry (hierarchical module naming scheme) are relevant
+        self.assertEqual(lmod.modulepath_entries_for([modtree]), [modpath_all, modpath_tools])
+        self.assertEqual(lmod.modulepath_entries_for([os.path.join(modpath_tools, 'test')]), [modpath_tools])
+
+        # cache is updated in batches if batch size is specified
+        build_options['update_modules_tool_cache_batch_size'] = 2
+        init_config(build_options=build_options)
+        for _ in range(5):
+            lmod.update(modpaths=[modpath_all])
+        self.assertEqual(len(spider_runs()), 3)
+        self.assertEqual(len(modules.MODULES_TOOL_CACHE_PENDING_UPDATES), 1)
+        lmod.flush_updates()
+        self.assertEqual(len(spider_runs()), 4)
+
+        # without --update-modules-tool-cache, nothing is postponed
+        init_config(build_options={'allow_modules_tool_mismatch': True})
+        lmod.update(modpaths=[modpath_all])
+        self.assertEqual(modules.MODULES_TOOL_CACHE_PENDING_UPDATES, [])
+        self.assertEqual(lmod.flush_updates(), None)
+        self.assertEqual(len(spider_runs()), 4)
+
     def test_environment_modules_specific(self):
         """Environment Modules-specific test (skipped unless installed)."""
         modulecmd_abspath = which(EnvironmentModules.COMMAND)
@@ -4485,6 +4485,50 @@ class CommandLineOptionsTest(EnhancedTestCase):
                 msg = "Pattern '%s' NOT found in: %s" % (notthere_regex.pattern, stdout)
                 self.assertFalse(notthere_regex.search(stdout), msg)
 
+    def test_extended_dry_run_parallel(self):
+        """Test use of --extended-dry-run-parallel."""
+        toy_ecs_dir = os.path.join(os.path.dirname(__file__), 'easyconfigs', 'test_ecs', 't', 'toy')
+        args = [os.path.join(toy_ecs_dir, x) for x in ('toy-0.0.eb', 'toy-0.0-iter.eb', 'toy-0.0-test.eb')]
+        args.extend(['--extended-dry-run', '--disable-rpath', '--force'])
+
+        def dry_run_output(extra_args):
+            """Return output of extended dry run, with variable parts (timings, temporary paths) filtered out."""
+            tmpdir = tempfile.gettempdir()
+            self.mock_stdout(True)
+            self.eb_main(args + extra_args, do_build=True, raise_error=True, testing=False)
+            stdout = self.get_stdout()
+            self.mock_stdout(False)
+            stdout = re.sub(r"\(took .*\)", '(took X secs)', stdout)
+            stdout = re.sub(r"log file\(s\) .*", 'log file(s) X', stdout)
+            stdout = re.sub(re.escape(tmpdir) + r'/eb-[^/\s]+', 'TMPDIR', stdout)
+            # also filter out messages on removal of temporary files/directories
+            return '\n'.join(line for line in stdout.split('\n') if not line.endswith(' removed'))
+
+        sequential_output = dry_run_output([])
+        regex = re.compile(r"^\*\*\* DRY RUN using 'EB_toy' easyblock", re.M)
+        self.assertEqual(len(regex.findall(sequential_output)), 3)
+
+        # keep track of extended dry runs that are performed in worker processes
+        orig_extended_dry_run_parallel = easybuild.main.extended_dry_run_parallel
+        dry_run_parallel_res = []
+
+        def mocked_extended_dry_run_parallel(*args, **kwargs):
+            res = orig_extended_dry_run_parallel(*args, **kwargs)
+            dry_run_parallel_res.append(res)
+            return res
+
+        easybuild.main.extended_dry_run_parallel = mocked_extended_dry_run_parallel
+        try:
+            parallel_output = dry_run_output(['--extended-dry-run-parallel=3'])
+        finally:
+            easybuild.main.extended_dry_run_parallel = orig_extended_dry_run_parallel
+
+        self.assertEqual(len(dry_run_parallel_res), 1)
+        self.assertEqual(len(dry_run_parallel_res[0]), 3)
+
+        # output for parallel dry run is identical to that of sequential dry run
+        self.assertEqual(parallel_output, sequential_output)
+
     def test_last_log(self):
         """Test --last-log."""
         orig_tmpdir = os.environ['TMPDIR']
@@ -31,16 +31,21 @@ import os
 import re
 import stat
 import sys
+import threading
+import time
 from test.framework.utilities import EnhancedTestCase, TestLoaderFiltered, init_config
 from unittest import TextTestRunner
 
 from easybuild.framework.easyconfig.tools import process_easyconfig
-from easybuild.tools import config
+from easybuild.tools import config, parallelbuild
 from easybuild.tools.build_log import EasyBuildError
 from easybuild.tools.config import get_module_syntax, update_build_option
-from easybuild.tools.filetools import adjust_permissions, mkdir, read_file, remove_dir, which, write_file
+from easybuild.tools.filetools import adjust_permissions, copy_dir, mkdir, read_file, remove_dir, remove_file, which
+from easybuild.tools.filetools import write_file
 from easybuild.tools.job import pbs_python
+from easybuild.tools.job.backend import JobBackend
 from easybuild.tools.job.pbs_python import PbsPython
+from easybuild.tools.job.slurm import Slurm
 from easybuild.tools.options import parse_options
 from easybuild.tools.parallelbuild import build_easyconfigs_in_parallel, submit_jobs
 from easybuild.tools.robot import resolve_dependencies
@@ -69,7 +74,7 @@ MOCKED_SBATCH = """#!/bin/bash
 if [[ $1 == '--version' ]]; then
     echo "slurm 17.0"
 else
-    echo "Submitted batch job $RANDOM"
+    echo "$RANDOM"
     echo "(submission args: $@)"
 fi
 """
@@ -78,6 +83,21 @@ MOCKED_SCONTROL = """#!/bin/bash
     echo "(scontrol args: $@)"
 """
 
+# mocked 'sbatch'/'scontrol' commands that record how they were called, and produce incremental job IDs
+RECORDING_SBATCH = """#!/bin/bash
+if [[ $1 == '--version' ]]; then
+    echo "slurm 23.02.7"
+else
+    jobid=$(( $(cat %(log)s 2>/dev/null | grep -c '^sbatch') + 100 ))
+    echo "sbatch $@" >> %(log)s
+    echo "${jobid};test_cluster"
+fi
+"""
+
+RECORDING_SCONTROL = """#!/bin/bash
+echo "scontrol $@" >> %(log)s
+"""
+
 
 def mock(*args, **kwargs):
     """Function used for mocking several functions imported in parallelbuild module."""
@@ -107,6 +127,27 @@ class MockPbsJob(object):
         pass
 
 
+class FakeJobBackend(JobBackend):
+    """Fake job backend, which only keeps track of queued jobs."""
+
+    def _check_version(self):
+        pass
+
+    def init(self):
+        self.queued = []
+
+    def make_job(self, script, name, env_vars=None, hours=None, cores=None):
+        job = MockPbsJob(None, script, cores=cores)
+        job.name = name
+        return job
+
+    def queue(self, job, dependencies=frozenset()):
+        self.queued.append(job.name)
+
+    def complete(self):
+        pass
+
+
 class ParallelBuildTest(EnhancedTestCase):
     """ Testcase for run module """
 
@@ -388,6 +429,143 @@ class ParallelBuildTest(EnhancedTestCase):
         }
         self.assertEqual(jobs[1].job_specs, expected)
 
+    def test_build_easyconfigs_in_parallel_prepare(self):
+        """Test concurrent preparation of easyconfigs in build_easyconfigs_in_parallel()."""
+        topdir = os.path.dirname(os.path.abspath(__file__))
+        test_ecs = os.path.join(topdir, 'easyconfigs', 'test_ecs')
+
+        # use copy of test source path as (local) source path
+        sourcepath = os.path.join(self.test_prefix, 'sources')
+        copy_dir(self.test_sourcepath, sourcepath)
+
+        # easyconfig for which source is not available
+        test_ec_txt = read_file(os.path.join(test_ecs, 't', 'toy', 'toy-0.0.eb'))
+        test_ec = os.path.join(self.test_prefix, 'test-0.0.eb')
+        write_file(test_ec, "easyblock = 'ConfigureMake'\n" + test_ec_txt.replace("name = 'toy'", "name = 'test'"))
+
+        ec_files = [
+            os.path.join(test_ecs, 'l', 'libtoy', 'libtoy-0.0.eb'),
+            os.path.join(test_ecs, 't', 'toy', 'toy-0.0.eb'),
+            os.path.join(test_ecs, 'g', 'gzip', 'gzip-1.4-GCC-4.6.3.eb'),
+            test_ec,
+        ]
+        easyconfigs = []
+        for ec_file in ec_files:
+            easyconfigs.extend(process_easyconfig(ec_file))
+
+        prepared = []
+
+        def fake_prepare_easyconfig(ec):
+            """Fake version of prepare_easyconfig, which keeps track of which easyconfigs were prepared where."""
+            time.sleep(0.1)
+            name = ec['ec'].name
+            prepared.append((name, threading.current_thread().name))
+            if name == 'test':
+                raise EasyBuildError("Failed to obtain source for %s", name)
+
+        backend = FakeJobBackend()
+        orig_job_backend = parallelbuild.job_backend
+        orig_prepare_easyconfig = parallelbuild.prepare_easyconfig
+        parallelbuild.job_backend = lambda: backend
+        parallelbuild.prepare_easyconfig = fake_prepare_easyconfig
+
+        try:
+            init_config(args=['--sourcepath=%s' % sourcepath], build_options={'job_prepare_threads': 2})
+
+            # all easyconfigs are prepared using (at most) 2 threads, error for last easyconfig is reported
+            error_pattern = "Failed to obtain source for test"
+            self.assertErrorRegex(EasyBuildError, error_pattern, build_easyconfigs_in_parallel, "echo '%(spec)s'",
+                                  easyconfigs)
+            self.assertEqual(sorted(name for name, _ in prepared), ['gzip', 'libtoy', 'test', 'toy'])
+            self.assertEqual(len(set(thread for _, thread in prepared)), 2)
+
+            # no jobs are submitted if preparation failed
+            self.assertEqual(backend.queued, [])
+
+            # with --job-defer-fetch, only easyconfigs for which sources are not available are prepared
+            prepared[:] = []
+            init_config(args=['--sourcepath=%s' % sourcepath], build_options={'job_defer_fetch': True})
+            self.assertErrorRegex(EasyBuildError, error_pattern, build_easyconfigs_in_parallel, "echo '%(spec)s'",
+                                  easyconfigs)
+            self.assertEqual([name for name, _ in prepared], ['test'])
+
+            # jobs are submitted in order
+            jobs = build_easyconfigs_in_parallel("echo '%(spec)s'", easyconfigs[:3])
+            self.assertEqual(len(jobs), 3)
+            self.assertEqual(backend.queued, ['libtoy-0.0', 'toy-0.0', 'gzip-1.4-GCC-4.6.3'])
+            self.assertEqual(len(prepared), 1)
+
+            # patches are considered too
+            remove_file(os.path.join(sourcepath, 'toy', 'toy-0.0_fix-silly-typo-in-printf-statement.patch'))
+            build_easyconfigs_in_parallel("echo '%(spec)s'", easyconfigs[:3])
+            self.assertEqual([name for name, _ in prepared], ['test', 'toy'])
+        finally:
+            parallelbuild.job_backend = orig_job_backend
+            parallelbuild.prepare_easyconfig = orig_prepare_easyconfig
+
+    def test_slurm_batched_submission(self):
+        """Test batched submission of jobs with Slurm backend, incl. grouping into array jobs."""
+        log = os.path.join(self.test_prefix, 'slurm_calls.log')
+        for cmd, txt in [('sbatch', RECORDING_SBATCH), ('scontrol', RECORDING_SCONTROL)]:
+            path = os.path.join(self.test_prefix, 'bin', cmd)
+            write_file(path, txt % {'log': log})
+            adjust_permissions(path, stat.S_IXUSR, add=True)
+
+        os.environ['PATH'] = os.path.pathsep.join([os.path.join(self.test_prefix, 'bin'), os.getenv('PATH')])
+
+        def queue_and_submit(array_jobs):
+            """Queue a set of jobs and submit them."""
+            remove_file(log)
+            init_config(build_options={'job_array_jobs': array_jobs, 'job_max_walltime': 5})
+            backend = Slurm()
+            backend.init()
+
+            # tc <- dep <- (leaf1, leaf2, leaf3 with 2 cores); tc <- leaf4
+            jobs = [backend.make_job("echo %s" % name, name, cores=cores)
+                    for name, cores in [('tc', 1), ('dep', 1), ('leaf1', 1), ('leaf2', 1), ('leaf3', 2), ('leaf4', 1)]]
+            for job in jobs:
+                job.module = job.name
+            deps = [[], [jobs[0]], [jobs[1]], [jobs[1]], [jobs[1]], [jobs[0]]]
+            for job, job_deps in zip(jobs, deps):
+                backend.queue(job, job_deps)
+
+            # nothing is submitted until complete is called
+            self.assertNotExists(log)
+
+            self.mock_stdout(True)
+            backend.complete()
+            stdout = self.get_stdout()
+            self.mock_stdout(False)
+            self.assertTrue(stdout.startswith("== List of submitted jobs (6): "))
+
+            return jobs, read_file(log).strip().splitlines()
+
+        jobs, calls = queue_and_submit(False)
+
+        self.assertEqual(len(calls), 7)
+        self.assertTrue(all(c.startswith('sbatch --parsable ') for c in calls[:6]))
+        self.assertEqual([job.jobid for job in jobs], ['100', '101', '103', '104', '105', '102'])
+        # jobs are submitted per level
+        self.assertIn('--job-name leaf4', calls[2])
+        self.assertIn('--dependency afterok:100', calls[2])
+        self.assertIn('--dependency afterok:101', calls[3])
+        self.assertEqual(calls[6], 'scontrol release 100 101 102 103 104 105')
+
+        jobs, calls = queue_and_submit(True)
+
+        # leaf1 + leaf2 are grouped into a single array job;
+        # leaf3 requires a different number of cores, leaf4 has different dependencies
+        self.assertEqual(len(calls), 6)
+        self.assertEqual([job.jobid for job in jobs], ['100', '101', '103_0', '103_1', '104', '102'])
+        array_call = calls[3]
+        self.assertIn('--array 0-1', array_call)
+        self.assertIn('--dependency afterok:101', array_call)
+        self.assertIn('--kill-on-invalid-dep=yes', array_call)
+        self.assertIn('--output easybuild-array-%A_%a.out', array_call)
+        self.assertIn('--wrap case $SLURM_ARRAY_TASK_ID in 0) echo leaf1 ;; 1) echo leaf2 ;; esac', array_call)
+        self.assertIn('--job-name leaf3', calls[4])
+        self.assertEqual(calls[5], 'scontrol release 100 101 102 103 104')
+
 
 def suite():
     """ returns all the testcases in this module """
@@ -28,6 +28,7 @@ Unit tests for toolchain support.
 @author: Kenneth Hoste (Ghent University)
 """
 
+import json
 import os
 import re
 import shutil
@@ -41,6 +42,7 @@ from test.framework.utilities import EnhancedTestCase, TestLoaderFiltered, find_
 import easybuild.tools.modules as modules
 import easybuild.tools.toolchain as toolchain
 import easybuild.tools.toolchain.compiler
+import easybuild.tools.toolchain.utilities as tc_utils
 from easybuild.framework.easyconfig.easyconfig import EasyConfig, ActiveMNS
 from easybuild.toolchains.compiler.gcc import Gcc
 from easybuild.toolchains.system import SystemToolchain
@@ -103,6 +105,61 @@ class ToolchainTest(EnhancedTestCase):
         self.assertEqual(tc, None)
         self.assertTrue(len(all_tcs) > 0)  # list of available toolchains
 
+    def test_toolchain_registry(self):
+        """Test toolchain registry, and caching of it via --toolchain-registry-cache."""
+        cache_path = os.path.join(self.test_prefix, 'toolchain-registry.json')
+        init_config(build_options={'silent': True, 'toolchain_registry_cache': cache_path})
+
+        # force re-processing of toolchain modules, which (re)creates the toolchain registry and caches it
+        processed_attr = '%s_PROCESSED' % tc_utils.TC_CONST_PREFIX
+        setattr(toolchain, processed_attr, False)
+        tc_class, _ = search_toolchain('foss')
+        self.assertEqual(tc_class.__name__, 'Foss')
+        self.assertTrue(getattr(toolchain, processed_attr))
+
+        registry = tc_utils.toolchain_registry()
+        self.assertEqual(registry['foss'], {
+            'class': 'Foss',
+            'composite': True,
+            'module': 'easybuild.toolchains.foss',
+            'optional': False,
+            'subtoolchain': ['gompi', 'golf', 'gfbf'],
+        })
+        self.assertEqual(registry['GCCcore']['subtoolchain'], 'system')
+        self.assertTrue(registry['GCCcore']['optional'])
+        self.assertFalse(registry['GCCcore']['composite'])
+        # alternative subtoolchains are specified via a tuple
+        self.assertEqual(registry['iimkl']['subtoolchain'], [('intel-compilers', 'iccifort')])
+
+        self.assertExists(cache_path)
+        cached_registry = json.loads(read_file(cache_path))
+        self.assertEqual(sorted(cached_registry['toolchains']), sorted(registry))
+        self.assertEqual(cached_registry['constants']['GCC'], 'GCC')
+
+        # cached toolchain registry is used if toolchain modules need to be processed again
+        setattr(toolchain, processed_attr, False)
+        loaded_registry = tc_utils._load_toolchain_registry()
+        self.assertTrue(loaded_registry['cached'])
+        self.assertEqual(loaded_registry['toolchains'], registry)
+        self.assertEqual(tc_utils.toolchain_registry(), registry)
+        tc_class, _ = search_toolchain('GCC')
+        self.assertEqual(tc_class.__name__, 'GccToolchain')
+        # toolchain modules were not processed again
+        self.assertFalse(getattr(toolchain, processed_attr))
+
+        # cached toolchain registry is ignored when toolchain modules change
+        cached_registry['signatures'][0][1] = None
+        write_file(cache_path, json.dumps(cached_registry))
+        self.assertEqual(tc_utils._load_toolchain_registry(), None)
+
+        # corrupt cache file is ignored too
+        write_file(cache_path, 'this is not JSON')
+        self.assertEqual(tc_utils._load_toolchain_registry(), None)
+
+        search_toolchain('')
+        self.assertTrue(getattr(toolchain, processed_attr))
+        self.assertEqual(json.loads(read_file(cache_path))['toolchains'].keys(), registry.keys())
+
     def test_system_toolchain(self):
         """Test for system toolchain."""
         for ver in ['system', '']:
@@ -2435,7 +2492,8 @@ class ToolchainTest(EnhancedTestCase):
 
         prepped_path_envvar = os.environ['PATH']
 
-        ccache_dir = os.path.join(self.test_prefix, 'ccache')
+        # per-toolchain subdirectory is used as cache directory
+        ccache_dir = os.path.join(self.test_prefix, 'ccache', 'system-system')
         mkdir(ccache_dir, parents=True)
 
         with self.mocked_stdout_stderr():
@@ -2467,7 +2525,7 @@ class ToolchainTest(EnhancedTestCase):
 
         # if both ccache and f90cache are used, Fortran compiler is symlinked to f90cache
         f90cache_dir = os.path.join(self.test_prefix, 'f90cache')
-        mkdir(f90cache_dir, parents=True)
+        mkdir(os.path.join(f90cache_dir, 'system-system'), parents=True)
         args.append("--use-f90cache=%s" % f90cache_dir)
 
         with self.mocked_stdout_stderr():
@@ -2477,11 +2535,58 @@ class ToolchainTest(EnhancedTestCase):
             self.assertTrue(regex.search(out), "Pattern '%s' found in: %s" % (regex.pattern, out))
 
         self.assertTrue(os.path.samefile(os.environ['CCACHE_DIR'], ccache_dir))
-        self.assertTrue(os.path.samefile(os.environ['F90CACHE_DIR'], f90cache_dir))
+        self.assertTrue(os.path.samefile(os.environ['F90CACHE_DIR'], os.path.join(f90cache_dir, 'system-system')))
         self.assertTrue(os.path.samefile(which('gcc'), os.path.join(self.test_prefix, 'scripts', 'ccache')))
         self.assertTrue(os.path.samefile(which('g++'), os.path.join(self.test_prefix, 'scripts', 'ccache')))
         self.assertTrue(os.path.samefile(which('gfortran'), os.path.join(self.test_prefix, 'scripts', 'f90cache')))
 
+    def test_compiler_cache_stats(self):
+        """Test configuration of ccache and reporting of ccache statistics."""
+        topdir = os.path.dirname(os.path.abspath(__file__))
+        eb_file = os.path.join(topdir, 'easyconfigs', 'test_ecs', 't', 'toy', 'toy-0.0.eb')
+
+        # mock ccache script that counts every compilation as a cache hit
+        stats_file = os.path.join(self.test_prefix, 'ccache_hits')
+        write_file(stats_file, '10')
+        ccache = os.path.join(self.test_prefix, 'scripts', 'ccache')
+        write_file(ccache, '\n'.join([
+            "#!/bin/bash",
+            "if [[ $1 == '--print-stats' ]]; then",
+            "    echo -e \"stats_updated_timestamp\\t1234\"",
+            "    echo -e \"direct_cache_hit\\t$(cat %s)\"" % stats_file,
+            "    echo -e \"preprocessed_cache_hit\\t0\"",
+            "    echo -e \"cache_miss\\t5\"",
+            "    exit 0",
+            "fi",
+            "echo $(( $(cat %s) + 1 )) > %s" % (stats_file, stats_file),
+            "NAME=${0##*/}",
+            "comms=($(which -a $NAME))",
+            "${comms[1]} \"$@\"",
+        ]))
+        adjust_permissions(ccache, stat.S_IXUSR, add=True)
+        setvar('PATH', '%s:%s' % (os.path.dirname(ccache), os.getenv('PATH')))
+
+        args = [
+            eb_file,
+            "--use-ccache=%s" % os.path.join(self.test_prefix, 'ccache'),
+            "--ccache-max-size=1G",
+            "--ccache-compress",
+            "--force",
+            "--debug",
+            "--disable-rpath",
+        ]
+        with self.mocked_stdout_stderr():
+            out = self.eb_main(args, raise_error=True, do_build=True, reset_env=False)
+
+        self.assertEqual(os.environ['CCACHE_DIR'], os.path.join(self.test_prefix, 'ccache', 'system-system'))
+        self.assertEqual(os.environ['CCACHE_MAXSIZE'], '1G')
+        self.assertEqual(os.environ['CCACHE_COMPRESS'], '1')
+        self.assertEqual(os.environ['CCACHE_NOHASHDIR'], '1')
+
+        # toy easyconfig has no cache misses, just a single compilation
+        regex = re.compile(r"Compiler cache \(ccache\) statistics: 1 hits, 0 misses, hit rate: 100.0%", re.M)
+        self.assertTrue(regex.search(out), "Pattern '%s' found in: %s" % (regex.pattern, out))
+
     def test_rpath_args_script(self):
         """Test rpath_args.py script"""
 
@@ -32,6 +32,7 @@ Toy build unit test
 import copy
 import glob
 import grp
+import json
 import os
 import re
 import shutil
@@ -1250,6 +1251,48 @@ class ToyBuildTest(EnhancedTestCase):
             toy_module += '.lua'
         self.assertExists(toy_module)
 
+    def test_toy_parallel_sanity_check(self):
+        """Test toy build with extensions, using --parallel-sanity-check."""
+        test_dir = os.path.abspath(os.path.dirname(__file__))
+        os.environ['MODULEPATH'] = os.path.join(test_dir, 'modules')
+        toy_ec = os.path.join(test_dir, 'easyconfigs', 'test_ecs', 't', 'toy', 'toy-0.0-gompi-2018a-test.eb')
+
+        # each sanity check command reports the (empty) working directory it was run in
+        out_files = [os.path.join(self.test_prefix, 'out%d.txt' % idx) for idx in range(3)]
+        toy_ec_txt = read_file(toy_ec) + '\n' + '\n'.join([
+            "sanity_check_commands = [",
+        ] + ["    '(pwd && ls | wc -l && touch out.txt) > %s'," % x for x in out_files] + [
+            "]",
+        ])
+        test_ec = os.path.join(self.test_prefix, 'test.eb')
+        write_file(test_ec, toy_ec_txt)
+
+        args = ['--parallel-sanity-check', '--debug']
+        with self.mocked_stdout_stderr():
+            outtxt = self._test_toy_build(ec_file=test_ec, versionsuffix='-gompi-2018a-test', extra_args=args)
+
+        work_dirs = []
+        for out_file in out_files:
+            work_dir, file_cnt = read_file(out_file).split('\n')[:2]
+            self.assertTrue(re.match('^.*/eb-sanity-check-[^/]+$', work_dir), "Unexpected work dir: %s" % work_dir)
+            self.assertEqual(file_cnt.strip(), '0')
+            work_dirs.append(work_dir)
+        self.assertEqual(len(set(work_dirs)), len(out_files))
+
+        self.assertIn("Running 3 sanity check commands in parallel", outtxt)
+        # exts_filter commands for all 4 extensions are run in parallel
+        self.assertIn("Running 4 sanity check commands in parallel", outtxt)
+        for ext_cmd in ("cat | grep '^bar$'", "ls -l lib/libtoy.a"):
+            self.assertIn("Using result of exts_filter command '%s' that was already run" % ext_cmd, outtxt)
+
+        # failing sanity check commands are reported as usual
+        write_file(test_ec, toy_ec_txt.replace("'(pwd", "'false && (pwd", 1))
+        error_pattern = r"Sanity check failed: sanity check command false && \(pwd .* failed with exit code 1"
+        with self.mocked_stdout_stderr():
+            self.assertErrorRegex(EasyBuildError, error_pattern, self._test_toy_build, ec_file=test_ec,
+                                  versionsuffix='-gompi-2018a-test', extra_args=args, raise_error=True,
+                                  verbose=False)
+
     def test_toy_hidden_cmdline(self):
         """Test installing a hidden module using the '--hidden' command line option."""
         test_ecs = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'easyconfigs', 'test_ecs')
@@ -3111,6 +3154,60 @@ class ToyBuildTest(EnhancedTestCase):
             self.assertErrorRegex(EasyBuildError, error_pattern, self._test_toy_build, ec_file=toy_ec,
                                   extra_args=args, name='toy-app', raise_error=True, verbose=False)
 
+    def test_toy_rpath_sanity_check_cache(self):
+        """Test use of --cache-rpath-sanity-check."""
+
+        test_ecs = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'easyconfigs', 'test_ecs')
+        toy_ec = os.path.join(test_ecs, 't', 'toy-app', 'toy-app-0.0.eb')
+
+        args = ['--rpath', '--cache-rpath-sanity-check']
+        with self.mocked_stdout_stderr():
+            self._test_toy_build(ec_file=toy_ec, name='toy-app', extra_args=args, raise_error=True)
+
+        toyapp_installdir = os.path.join(self.test_installpath, 'software', 'toy-app', '0.0')
+        toyapp_bin = os.path.join(toyapp_installdir, 'bin', 'toy-app')
+        manifest = os.path.join(toyapp_installdir, 'easybuild', 'rpath-sanity-check.json')
+        self.assertExists(manifest)
+        manifest_files = json.loads(read_file(manifest))['files']
+        self.assertIn(toyapp_bin, manifest_files)
+        self.assertEqual(manifest_files[toyapp_bin]['fails'], [])
+        self.assertTrue(any(os.path.basename(p) == 'libtoy.so' for (p, _) in manifest_files[toyapp_bin]['libs']))
+
+        cached_msg = "Using cached RPATH sanity check result for unchanged file " + toyapp_bin
+        checking_msg = "Sanity checking RPATH for " + toyapp_bin
+
+        # cached result is used when installation did not change
+        # (--rebuild rather than --force, since --force implies skipping the sanity check in module-only mode)
+        args.extend(['--module-only', '--rebuild'])
+        with self.mocked_stdout_stderr():
+            outtxt = self._test_toy_build(ec_file=toy_ec, name='toy-app', extra_args=args, raise_error=True,
+                                          verify=False, force=False)
+        self.assertIn(cached_msg, outtxt)
+        self.assertNotIn(checking_msg, outtxt)
+
+        # binary is checked again when it was changed
+        stat_info = os.stat(toyapp_bin)
+        os.utime(toyapp_bin, (stat_info.st_atime, stat_info.st_mtime + 10))
+        with self.mocked_stdout_stderr():
+            outtxt = self._test_toy_build(ec_file=toy_ec, name='toy-app', extra_args=args, raise_error=True,
+                                          verify=False, force=False)
+        self.assertIn(checking_msg, outtxt)
+        self.assertNotIn(cached_msg, outtxt)
+
+        # cached results are ignored when context of RPATH sanity check changes
+        with self.mocked_stdout_stderr():
+            outtxt = self._test_toy_build(ec_file=toy_ec, name='toy-app', raise_error=True, verify=False, force=False,
+                                          extra_args=args + ['--filter-rpath-sanity-libs=libfoo.so'])
+        self.assertIn(checking_msg, outtxt)
+        self.assertNotIn(cached_msg, outtxt)
+
+        # without --cache-rpath-sanity-check, cached results are not used
+        with self.mocked_stdout_stderr():
+            outtxt = self._test_toy_build(ec_file=toy_ec, name='toy-app', raise_error=True, verify=False, force=False,
+                                          extra_args=['--rpath', '--module-only', '--rebuild'])
+        self.assertIn(checking_msg, outtxt)
+        self.assertNotIn(cached_msg, outtxt)
+
     def test_toy_modaltsoftname(self):
         """Build two dependent toys as in test_toy_toy but using modaltsoftname"""
         topdir = os.path.dirname(os.path.abspath(__file__))